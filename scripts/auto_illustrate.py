@@ -28,7 +28,11 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import requests
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.capped_download import DEFAULT_CAPS, download_to
+from scripts.utils.http_replay import install_from_env
 
 QUICKCHART_ENDPOINT = "https://quickchart.io/chart"
 
@@ -189,9 +193,8 @@ def download_chart_png(cfg: dict, out_path: Path, width: int = 1200, height: int
         "backgroundColor": "white",
         "devicePixelRatio": "2",
     }
-    r = requests.get(QUICKCHART_ENDPOINT, params=params, timeout=60)
-    r.raise_for_status()
-    out_path.write_bytes(r.content)
+    # Streamed to disk under the image cap instead of buffering the whole response
+    download_to(QUICKCHART_ENDPOINT, out_path, timeout=60, max_bytes=DEFAULT_CAPS["image/"], params=params)
 
 
 def already_has_chart_after(lines: List[str], end_idx: int) -> bool:
@@ -289,6 +292,7 @@ def main() -> None:
     ap.add_argument("--all", action="store_true", help="Illustrate all numeric tables (default: key tables only)")
     ap.add_argument("posts", nargs="+", help="Markdown post paths")
     args = ap.parse_args()
+    install_from_env()
 
     total = 0
     for p in args.posts:
@@ -29,8 +29,8 @@ async def run_pipeline(config_path: str = "config/config.yaml"):
     if not health.get("ok"):
         logger.warning(f"健康检查未通过: {health}")
 
-    runner = CollectorRunner(cfg)
-    industry_articles = await runner.collect_all()
+    async with CollectorRunner(cfg) as runner:
+        industry_articles = await runner.collect_all()
 
     analyzer = TrendAnalyzer(cfg)
     analysis_batch = await analyzer.analyze_all(industry_articles)
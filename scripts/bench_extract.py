@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark article extraction CPU cost over saved HTML samples.
+
+Compares the previous three-parse pipeline (readability on the raw string,
+BeautifulSoup over readability's output, BeautifulSoup over the full page for
+the cover) with collect_news.extract_page, which builds one lxml tree per page.
+
+Samples are plain *.html files (any saved article pages) or the latest bodies
+in a collect_news --archive directory. Results are CPU time per page
+(time.process_time), best of --repeat runs.
+
+Usage:
+  python3 scripts/bench_extract.py --dir data/bench/html --repeat 3
+  python3 scripts/bench_extract.py --archive data/cache/html_archive
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from readability import Document
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from collect_news import decode_html, extract_page, norm_space  # noqa: E402
+from scripts.utils.html_archive import HtmlArchive, read_object  # noqa: E402
+
+
+def legacy_extract(html: str, base_url: str) -> Tuple[str, str, Optional[str]]:
+    """The pre-refactor pipeline, kept here as the benchmark baseline."""
+    doc = Document(html)
+    title = norm_space(doc.short_title())
+    soup = BeautifulSoup(doc.summary(html_partial=True), "lxml")
+    text = norm_space(soup.get_text("\n"))
+    text = "\n".join([norm_space(x) for x in text.split("\n") if norm_space(x)])
+
+    cover = None
+    page = BeautifulSoup(html, "lxml")
+    og = page.select_one('meta[property="og:image"], meta[name="og:image"], meta[property="twitter:image"], meta[name="twitter:image"]')
+    if og and og.get("content"):
+        cover = og["content"].strip()
+    else:
+        for img in page.select("article img, main img, .article img, .post img"):
+            src = img.get("src") or img.get("data-src") or img.get("data-original")
+            if src and not src.strip().startswith("data:"):
+                cover = src.strip()
+                break
+    return title, text, cover
+
+
+def cpu_per_page(fn: Callable[[str, str], object], pages: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.process_time()
+        for html in pages:
+            try:
+                fn(html, "")
+            except Exception:
+                pass
+        best = min(best, time.process_time() - t0)
+    return best / max(1, len(pages))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", default="data/bench/html", help="Directory of saved *.html pages")
+    ap.add_argument("--archive", default="", help="Use the latest bodies from a collect_news --archive directory")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.archive:
+        archive = HtmlArchive(args.archive)
+        pages = [decode_html(read_object(r["path"]), r.get("content_type") or "") for r in archive.latest()]
+        archive.close()
+    else:
+        pages = [p.read_text(encoding="utf-8", errors="replace") for p in sorted(Path(args.dir).glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"no samples under {args.archive or args.dir}")
+
+    legacy = cpu_per_page(legacy_extract, pages, args.repeat)
+    single = cpu_per_page(extract_page, pages, args.repeat)
+
+    # Sanity check: both pipelines should agree on title and cover
+    mismatches = 0
+    for html in pages:
+        try:
+            a, b = legacy_extract(html, ""), extract_page(html, "")
+        except Exception:
+            continue
+        if a[0] != b[0] or a[2] != b[2]:
+            mismatches += 1
+
+    print(
+        json.dumps(
+            {
+                "pages": len(pages),
+                "legacy_ms_per_page": round(legacy * 1000, 2),
+                "single_parse_ms_per_page": round(single * 1000, 2),
+                "saving_pct": round((1 - single / legacy) * 100, 1) if legacy else 0.0,
+                "title_or_cover_mismatches": mismatches,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
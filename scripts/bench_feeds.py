@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark feed parsing over recorded RSS/Atom bodies.
+
+Compares feedparser on the full body (the previous path: parse everything, then
+slice) with collect_news.parse_feed_stream, which parses incrementally, skips
+entries older than the --hours cutoff and stops after --max-entries entries or a
+run of stale ones. Also checks that both agree on url/title/published for the
+entries the stream parser returns.
+
+Recorded feeds are plain files (*.xml) in --dir; --record fetches every feed in a
+sources YAML into that directory first.
+
+Usage:
+  python3 scripts/bench_feeds.py --record scripts/news_sources.yaml --dir data/bench/feeds
+  python3 scripts/bench_feeds.py --dir data/bench/feeds --max-entries 20 --hours 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import feedparser
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from collect_news import entry_to_dict, load_sources, make_session, parse_feed_stream  # noqa: E402
+
+
+def record(sources_yaml: Path, out_dir: Path) -> int:
+    cfg = load_sources(sources_yaml)
+    session = make_session(cfg.get("global", {}).get("user_agent", "Mozilla/5.0"), 4)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n = 0
+    for feeds in (cfg.get("industries") or {}).values():
+        for f in feeds:
+            try:
+                r = session.get(f["rss"], timeout=20)
+                r.raise_for_status()
+            except Exception as e:
+                print(f"skip {f.get('name')}: {e}", file=sys.stderr)
+                continue
+            name = hashlib.sha1(f["rss"].encode("utf-8")).hexdigest()[:12]
+            (out_dir / f"{name}.xml").write_bytes(r.content)
+            n += 1
+    return n
+
+
+def chunked(body: bytes, size: int = 64 * 1024):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+def cpu_per_feed(fn: Callable[[bytes], object], bodies: List[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.process_time()
+        for body in bodies:
+            fn(body)
+        best = min(best, time.process_time() - t0)
+    return best / max(1, len(bodies))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", default="data/bench/feeds", help="Directory of recorded *.xml feed bodies")
+    ap.add_argument("--record", default="", help="Fetch every feed in this sources YAML into --dir first")
+    ap.add_argument("--max-entries", type=int, default=20)
+    ap.add_argument("--hours", type=float, default=0, help="Freshness cutoff for the stream parser (0 = none)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.record:
+        print(f"recorded {record(Path(args.record), Path(args.dir))} feeds", file=sys.stderr)
+
+    bodies = [p.read_bytes() for p in sorted(Path(args.dir).glob("*.xml"))]
+    if not bodies:
+        raise SystemExit(f"no samples under {args.dir}")
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=args.hours) if args.hours else None
+
+    def full(body: bytes) -> List[Dict]:
+        return [entry_to_dict(e) for e in feedparser.parse(body).entries[: args.max_entries]]
+
+    def fresh(entries: List[Dict]) -> List[Dict]:
+        return [
+            e
+            for e in entries
+            if cutoff is None or not e["published"] or datetime.fromisoformat(e["published"]) >= cutoff
+        ]
+
+    def stream(body: bytes) -> List[Dict]:
+        return parse_feed_stream(chunked(body), args.max_entries, cutoff)[0]
+
+    legacy = cpu_per_feed(full, bodies, args.repeat)
+    streamed = cpu_per_feed(stream, bodies, args.repeat)
+
+    stats: Dict[str, int] = {}
+    mismatches = bytes_read = 0
+    for body in bodies:
+        a = fresh([entry_to_dict(e) for e in feedparser.parse(body).entries])
+        b, n = parse_feed_stream(chunked(body), args.max_entries, cutoff, stats)
+        bytes_read += n
+        key = lambda e: (e["url"], e["title"], e["published"])  # noqa: E731
+        if [key(e) for e in a[: len(b)]] != [key(e) for e in b]:
+            mismatches += 1
+
+    print(
+        json.dumps(
+            {
+                "feeds": len(bodies),
+                "feedparser_ms_per_feed": round(legacy * 1000, 2),
+                "stream_ms_per_feed": round(streamed * 1000, 2),
+                "saving_pct": round((1 - streamed / legacy) * 100, 1) if legacy else 0.0,
+                "bytes_read_pct": round(bytes_read / max(1, sum(map(len, bodies))) * 100, 1),
+                "stream_stopped": stats.get("stream_stopped", 0),
+                "parser_fallback": stats.get("parser_fallback", 0),
+                "feeds_with_mismatches": mismatches,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
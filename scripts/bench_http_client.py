@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Measure BaseCollector.fetch_url latency with and without the shared client.
+
+Starts a local HTTP server and fetches one list page plus --articles article
+pages through BaseCollector.fetch_url twice: once with no injected client (the
+previous path: a new httpx.AsyncClient, so a new connection, per URL) and once
+with the pooled client from create_async_client (what CollectorRunner injects).
+Caching is off for both passes so every URL is a real request.
+
+A loopback TCP connect costs next to nothing, so the server delays the first
+request on each new connection by --connect-delay-ms to stand in for the
+TCP+TLS handshake round trips paid against a real site.
+
+Usage:
+  python3 scripts/bench_http_client.py --articles 20 --connect-delay-ms 30 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.collectors.base_collector import HTTP2_AVAILABLE, BaseCollector, create_async_client  # noqa: E402
+
+
+def start_server(connect_delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # headers and body go out in separate writes; without this, Nagle + delayed ACK
+        # adds ~40ms to every request on a reused connection
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            self.fresh_connection = True
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            if self.fresh_connection:
+                time.sleep(connect_delay)
+                self.fresh_connection = False
+            body = f"<html><body><article><p>{self.path}</p>{'<p>text</p>' * 200}</article></body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class BenchCollector(BaseCollector):
+    async def collect(self) -> List[Dict[str, Any]]:
+        return []
+
+
+async def run_pass(config: Dict[str, Any], urls: List[str], shared: bool) -> List[float]:
+    collector = BenchCollector(config, {"name": "bench", "url": urls[0]})
+    client = create_async_client(config) if shared else None
+    collector.client = client
+    latencies = []
+    try:
+        for url in urls:
+            t0 = time.perf_counter()
+            if await collector.fetch_url(url, use_cache=False) is None:
+                raise SystemExit(f"fetch failed: {url}")
+            latencies.append((time.perf_counter() - t0) * 1000)
+    finally:
+        if client is not None:
+            await client.aclose()
+    return latencies
+
+
+def summarize(samples: List[List[float]]) -> Dict[str, float]:
+    flat = [x for run in samples for x in run]
+    return {
+        "total_ms": round(min(sum(run) for run in samples), 1),
+        "p50_ms": round(statistics.median(flat), 2),
+        "p95_ms": round(sorted(flat)[int(len(flat) * 0.95) - 1], 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--articles", type=int, default=20)
+    ap.add_argument("--connect-delay-ms", type=float, default=30, help="Simulated handshake cost per new connection")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    server = start_server(args.connect_delay_ms / 1000)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/list"] + [f"{base}/a/{i}" for i in range(args.articles)]
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"storage": {"cache_dir": tmp}, "logging": {"level": "WARNING"}}
+        before = [asyncio.run(run_pass(config, urls, shared=False)) for _ in range(args.repeat)]
+        after = [asyncio.run(run_pass(config, urls, shared=True)) for _ in range(args.repeat)]
+    server.shutdown()
+
+    print(
+        json.dumps(
+            {
+                "requests": len(urls),
+                "connect_delay_ms": args.connect_delay_ms,
+                "http2_available": HTTP2_AVAILABLE,
+                "per_request_client": summarize(before),
+                "shared_client": summarize(after),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
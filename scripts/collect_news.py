@@ -2,31 +2,106 @@
 """Collect news from RSS feeds and extract main text + a relevant cover image.
 
 - Uses RSS feeds defined in scripts/news_sources.yaml
-- Fetches each article HTML and extracts readable text
+- Requests feeds conditionally (ETag / Last-Modified) and reuses the previously
+  parsed entries on 304 (state in data/cache/feed_state.json)
+- Keeps a seen-URL ledger (data/cache/seen_urls.sqlite) so pages extracted on a
+  previous run are reused instead of refetched; --skip-used drops URLs already
+  cited by a generated post
+- Fetches article pages concurrently (global + per-host caps) and extracts readable text
 - Extracts a cover image (og:image preferred, else first meaningful <img>)
-- Outputs a JSON payload for downstream generation
+- Builds a single lxml tree per page; title, readable text and cover candidates
+  are all derived from it (see scripts/bench_extract.py)
+- Decodes pages via HTTP charset -> BOM/<meta charset> sniff -> UTF-8 probe, and
+  only runs statistical detection on a bounded prefix (counts in meta.charset)
+- --deadline-seconds bounds the whole run: outstanding fetches are abandoned at the
+  deadline (bodies still streaming are cut off, so stragglers cannot keep the process
+  alive) and the sources that were cut off are listed in meta.deadline
+- --industries a,b / all collects several industries in one process, sharing the HTTP
+  pool, feed/page fetches and extraction results; one payload per industry in --out-dir
+- Pipelines I/O and CPU: download threads hand raw bodies to a process pool that
+  decodes + extracts them, through a bounded queue (backpressure keeps memory flat)
+- Learns, per host, which node readability picks as the article body and extracts
+  later pages from that host with the learned selector (readability as fallback)
+- Sources without RSS may give `sitemap:` (plus an optional `match:` URL regex); sitemaps
+  and sitemap indexes are polled incrementally by lastmod and feed the same pipeline
+- Clusters near-duplicate entries (same story in several feeds) before fetching pages;
+  one representative per story is fetched and the others are carried as `related`
+- Trips a per-feed circuit breaker after repeated failures (state in
+  data/cache/source_health.json): open feeds are skipped without a request until a
+  half-open probe, with exponentially growing open periods; health is in meta.health
+- Keeps a per-source yield scorecard (freshness, extraction success, latency, citations)
+  and fetches low-yield feeds only when the others do not fill --limit (plus once a day
+  anyway, so a recovered source can earn its way back; older history decays)
+- Caches article pages by HTTP semantics (data/cache/http): fresh responses per
+  Cache-Control/Expires are not refetched, stale-while-revalidate ones are served
+  and refreshed in the background, others are revalidated conditionally
+- Remembers failed page URLs (data/cache/negative_urls.json): 404/410/403 are not
+  requested again for days, timeouts/5xx for minutes, growing exponentially on repeats;
+  hits are in meta.negative_cache
+- Streams page bodies with a size cap (Content-Length pre-check, truncation once enough
+  HTML for extraction has arrived); bytes not downloaded are reported in meta.download
+- NEWS_HTTP_MODE=record|replay (scripts/utils/http_replay.py) records every HTTP response
+  to a local cassette or serves the run from one, for offline benchmarks
+- --archive DIR keeps every fetched page body content-addressed and compressed;
+  --replay DIR re-runs extraction over the archive in a process pool (no network)
+- Outputs a JSON payload for downstream generation; with an --out ending in .jsonl the
+  payload is streamed instead (header line with meta/count, then one item per line as
+  items complete; see scripts/utils/news_payload.py for the readers)
 
 Usage:
   python3 scripts/collect_news.py --industry technology --hours 24 --limit 30 --out data/raw/news_XXX.json
+  python3 scripts/collect_news.py --industries all --hours 24 --limit 25 --out-dir data/raw/batch
+  python3 scripts/collect_news.py --replay data/cache/html_archive --out data/replay.json
 """
 
 from __future__ import annotations
 
 import argparse
-import hashlib
+import codecs
 import json
+import multiprocessing
+import os
 import re
+import sys
+import threading
 import time
-from dataclasses import asdict, dataclass
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 
 import feedparser
 import requests
 import yaml
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml.html import HtmlElement
 from readability import Document
+from readability.htmls import build_doc, shorten_title
+from requests.compat import chardet
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.capped_download import DOWNLOAD_STATS, DeadlinePassed, abort_at, fetch_capped
+from scripts.utils.circuit_breaker import CircuitBreaker
+from scripts.utils.extract_templates import TemplateStore
+from scripts.utils.feed_state import FeedStateStore
+from scripts.utils.feed_stream import FeedStream
+from scripts.utils.html_archive import HtmlArchive, read_object
+from scripts.utils.http_cache import FRESH, STALE_REVALIDATE, HttpCache
+from scripts.utils.http_replay import install_from_env, state_path
+from scripts.utils.negative_cache import NegativeCache, classify
+from scripts.utils.news_payload import JsonlPayloadWriter, is_jsonl
+from scripts.utils.news_payload import write_payload as write_payload_file
+from scripts.utils.seen_ledger import SeenLedger, url_hash
+from scripts.utils.sitemap_discovery import SitemapTracker
+from scripts.utils.source_scores import SourceScorecard
+from scripts.utils.story_clusters import cluster as cluster_entries
+from scripts.utils.story_clusters import shingles
 
 
 @dataclass
@@ -39,6 +114,10 @@ class NewsItem:
     summary: str
     content_text: str
     cover_image_url: Optional[str]
+    # Other cover candidates on the page, for dimension probing in generate_news_post
+    cover_candidates: List[str] = field(default_factory=list)
+    # Same story from other feeds (clustered before fetching): source/title/url/published
+    related: List[Dict[str, Any]] = field(default_factory=list)
 
 
 def load_sources(path: Path) -> dict:
@@ -49,6 +128,34 @@ def norm_space(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip())
 
 
+_stats_lock = threading.Lock()
+
+
+def bump(stats: Dict[str, int], key: str, n: int = 1) -> None:
+    # Stats dicts are shared by the fetch worker threads
+    with _stats_lock:
+        stats[key] = stats.get(key, 0) + n
+
+
+class DeadlineExceeded(Exception):
+    """Marks a fetch that was still pending or in flight when the run deadline expired."""
+
+
+class CircuitOpen(Exception):
+    """Marks a feed skipped without a request because its circuit breaker is open."""
+
+
+class RecentlyFailed(Exception):
+    """Marks a page skipped without a request because it failed recently (negative cache)."""
+
+
+def time_left(deadline: Optional[float], default: float = 20) -> float:
+    """Per-request timeout: the usual default, shrunk so no request outlives the deadline."""
+    if deadline is None:
+        return default
+    return max(0.5, min(default, deadline - time.monotonic()))
+
+
 def parse_published(entry: Any) -> Optional[datetime]:
     # feedparser gives .published_parsed
     if getattr(entry, "published_parsed", None):
@@ -58,32 +165,457 @@ def parse_published(entry: Any) -> Optional[datetime]:
     return None
 
 
-def fetch_html(url: str, user_agent: str, timeout: int = 20) -> str:
-    r = requests.get(url, headers={"User-Agent": user_agent}, timeout=timeout)
-    r.raise_for_status()
-    r.encoding = r.apparent_encoding or "utf-8"
-    return r.text
+def entry_to_dict(entry: Any) -> Dict[str, Any]:
+    published_dt = parse_published(entry)
+    return {
+        "url": getattr(entry, "link", None),
+        "title": norm_space(getattr(entry, "title", "")),
+        "summary": norm_space(getattr(entry, "summary", "")),
+        "published": published_dt.isoformat() if published_dt else None,
+    }
+
+
+def _stream_entry(e: Dict[str, Any]) -> Dict[str, Any]:
+    """FeedStream entry in the entry_to_dict shape."""
+    return {
+        "url": e["url"],
+        "title": norm_space(e["title"]),
+        "summary": norm_space(e["summary"]),
+        "published": e["published"].isoformat() if e["published"] else None,
+    }
+
+
+# Consecutive entries older than the cutoff, after a fresh one, that end a streamed feed read
+STALE_RUN_STOP = 3
+
+
+def parse_feed_stream(
+    chunks: Iterator[bytes],
+    max_entries: int,
+    cutoff: Optional[datetime] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse a feed incrementally; returns (entries, bytes_read).
+
+    Entries older than cutoff are skipped (a stale pinned post may sit on top). Reading
+    stops once max_entries are parsed, or after STALE_RUN_STOP stale entries in a row
+    following at least one fresh one. Malformed feeds (or ones with no recognisable
+    entries) are read to the end and handed to feedparser.
+    """
+    stats = stats if stats is not None else {}
+    stream = FeedStream()
+    buf: List[bytes] = []
+    entries: List[Dict[str, Any]] = []
+    fresh_seen = False
+    stale_run = 0
+    try:
+        for chunk in chunks:
+            buf.append(chunk)
+            for e in stream.feed(chunk):
+                published = e["published"]
+                if cutoff is not None and published is not None:
+                    if published < cutoff:
+                        stale_run += 1
+                        bump(stats, "stream_skipped_stale")
+                        if fresh_seen and stale_run >= STALE_RUN_STOP:
+                            bump(stats, "stream_stopped")
+                            return entries, sum(map(len, buf))
+                        continue
+                    fresh_seen, stale_run = True, 0
+                entries.append(_stream_entry(e))
+                if len(entries) >= max_entries:
+                    bump(stats, "stream_stopped")
+                    return entries, sum(map(len, buf))
+        entries += [
+            _stream_entry(e)
+            for e in stream.close()
+            if cutoff is None or e["published"] is None or e["published"] >= cutoff
+        ]
+        if not stream.entries_seen:
+            raise ValueError("no RSS/Atom entries found")
+    except (etree.XMLSyntaxError, ValueError):
+        bump(stats, "parser_fallback")
+        body = b"".join(buf) + b"".join(chunks)
+        parsed = feedparser.parse(body)
+        return [entry_to_dict(e) for e in parsed.entries[:max_entries]], len(body)
+    return entries[:max_entries], sum(map(len, buf))
+
+
+def fetch_feed_entries(
+    rss: str,
+    session: requests.Session,
+    max_entries: int,
+    state: Optional[FeedStateStore] = None,
+    stats: Optional[Dict[str, int]] = None,
+    timeout: float = 20,
+    cutoff: Optional[datetime] = None,
+    deadline: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch and parse one feed; a 304 against stored validators reuses the stored entries.
+
+    A monotonic ``deadline`` aborts a body still streaming when it passes (DeadlineExceeded).
+    """
+    stats = stats if stats is not None else {}
+    # Some feeds block non-browser UAs when fetched by feedparser directly.
+    # Fetch via the UA session, streaming the body into the incremental parser.
+    headers = state.conditional_headers(rss) if state else {}
+    resp = session.get(rss, headers=headers, timeout=timeout, stream=True)
+    if resp.status_code == 304 and state:
+        resp.close()
+        cached = state.cached_entries(rss)
+        if cached is not None:
+            bump(stats, "not_modified")
+            return cached[:max_entries]
+        # Validators without stored entries: drop them and refetch in full
+        resp = session.get(rss, timeout=timeout, stream=True)
+    try:
+        with resp, abort_at(resp, deadline):
+            resp.raise_for_status()
+            bump(stats, "fetched")
+            entries, nbytes = parse_feed_stream(resp.iter_content(64 * 1024), max_entries, cutoff, stats)
+    except DeadlinePassed as e:
+        raise DeadlineExceeded(rss) from e
+    bump(stats, "bytes", nbytes)
+
+    if state:
+        state.update(rss, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), entries)
+    return entries
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def make_session(user_agent: str, pool_size: int) -> requests.Session:
+    """Shared session so concurrent page fetches reuse keep-alive connections per host."""
+    s = requests.Session()
+    s.headers.update({"User-Agent": user_agent})
+    adapter = requests.adapters.HTTPAdapter(pool_connections=max(pool_size, 10), pool_maxsize=pool_size)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-]+)""", re.I)
+HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?\s*([a-zA-Z0-9_\-]+)", re.I)
+BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+# Chinese sites routinely label GBK/GB18030 pages as gb2312; decode with the superset
+CHARSET_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "x-gbk": "gb18030", "iso-8859-1": "cp1252"}
+SNIFF_BYTES = 4096
+DETECT_BYTES = 32 * 1024
+
+# How often each detection path decided the encoding (reported in payload meta)
+CHARSET_STATS: Counter = Counter()
+
+
+def _valid_charset(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    name = CHARSET_ALIASES.get(name.strip().lower(), name.strip().lower())
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content: bytes, content_type: str = "") -> Tuple[str, str]:
+    """Return (encoding, path) choosing the cheapest trustworthy source first.
+
+    Order: HTTP Content-Type charset, BOM, <meta charset> in the first few KB,
+    strict UTF-8 probe of a prefix, then statistical detection on that prefix only.
+    """
+    m = HEADER_CHARSET_RE.search(content_type or "")
+    enc = _valid_charset(m.group(1)) if m else None
+    if enc:
+        return enc, "header"
+
+    for bom, name in BOMS:
+        if content.startswith(bom):
+            return name, "bom"
+
+    m = CHARSET_RE.search(content[:SNIFF_BYTES])
+    enc = _valid_charset(m.group(1).decode("ascii", "ignore")) if m else None
+    if enc:
+        return enc, "meta"
+
+    prefix = content[:DETECT_BYTES]
+    try:
+        # final=False tolerates a multi-byte sequence cut off at the prefix boundary
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8", "utf8_probe"
+    except UnicodeDecodeError:
+        pass
+
+    enc = _valid_charset((chardet.detect(prefix) or {}).get("encoding"))
+    if enc:
+        return enc, "detect"
+    return "utf-8", "default"
+
 
+def decode_html(content: bytes, content_type: str = "") -> str:
+    enc, path = detect_encoding(content, content_type)
+    with _stats_lock:
+        CHARSET_STATS[path] += 1
+    return content.decode(enc, errors="replace")
 
-def extract_readable(html: str, base_url: str) -> Tuple[str, str]:
-    doc = Document(html)
-    title = norm_space(doc.short_title())
-    content_html = doc.summary(html_partial=True)
-    soup = BeautifulSoup(content_html, "lxml")
-    text = norm_space(soup.get_text("\n"))
-    # Keep multi-paragraph structure (readability may collapse)
-    text = "\n".join([norm_space(x) for x in text.split("\n") if norm_space(x)])
+
+def _download_body(
+    url: str,
+    user_agent: str,
+    timeout: float,
+    session: Optional[requests.Session],
+    archive: Optional[HtmlArchive],
+    max_bytes: Optional[int],
+    cache: Optional[HttpCache],
+    entry: Optional[Dict[str, Any]],
+    deadline: Optional[float] = None,
+) -> Tuple[bytes, str]:
+    """GET (conditional when a cached entry exists); a 304 refreshes and returns the cached body."""
+    headers = {"User-Agent": user_agent}
+    headers.update(HttpCache.conditional_headers(entry))
+    info: Dict[str, Any] = {}
+    try:
+        body, content_type, truncated = fetch_capped(
+            url,
+            session=session,
+            timeout=timeout,
+            max_bytes=max_bytes,
+            truncate=True,
+            headers=headers,
+            info=info,
+            deadline=deadline,
+        )
+    except DeadlinePassed as e:
+        raise DeadlineExceeded(url) from e
+    if info["status"] == 304 and entry:
+        entry = cache.refresh(url, entry, info["headers"])
+        body, content_type = entry["body"], entry["headers"].get("content-type", "")
+        if archive:
+            archive.put(url, body, content_type)
+        return body, content_type
+    if archive:
+        archive.put(url, body, content_type)
+    # A truncated body is only good for extraction, not as a cached copy of the page
+    if cache and not truncated:
+        cache.store(url, info["status"], info["headers"], body)
+    return body, content_type
+
+
+def _failure_kind(e: Exception) -> Tuple[Optional[str], Optional[int]]:
+    """(negative cache kind, HTTP status) for a failed download; kind is None when not worth caching."""
+    if isinstance(e, requests.Timeout):
+        return "timeout", None
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return classify(e.response.status_code), e.response.status_code
+    if isinstance(e, requests.ConnectionError):
+        return "error", None
+    return None, None
+
+
+def fetch_body(
+    url: str,
+    user_agent: str,
+    timeout: float = 20,
+    session: Optional[requests.Session] = None,
+    archive: Optional[HtmlArchive] = None,
+    max_bytes: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+    negative: Optional[NegativeCache] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[bytes, str]:
+    """Download a page and return (raw_body, content_type); decoding is left to the caller.
+
+    Bodies are streamed and cut at max_bytes (default: the per-type cap in
+    capped_download); the article text sits well inside the first megabyte.
+    With a cache, fresh responses (per Cache-Control/Expires) are served without a
+    request, stale-while-revalidate ones are served and revalidated in the background,
+    and anything else is revalidated with If-None-Match/If-Modified-Since. The archive
+    receives every body the run uses, cache-served ones included.
+    With a negative cache, a URL that failed recently raises RecentlyFailed without a
+    request, and new failures are recorded. The read timeout only bounds each socket
+    read, so a monotonic ``deadline`` also aborts a body still streaming when it passes
+    (DeadlineExceeded).
+    """
+    entry = cache.lookup(url) if cache else None
+    if entry and entry["state"] in (FRESH, STALE_REVALIDATE):
+        if entry["state"] == STALE_REVALIDATE:
+            cache.revalidate_later(
+                url,
+                lambda: _download_body(url, user_agent, timeout, session, None, max_bytes, cache, entry, deadline),
+            )
+        body, content_type = entry["body"], entry["headers"].get("content-type", "")
+        # Archive what this run served, so a --replay of it sees cached pages too
+        if archive:
+            archive.put(url, body, content_type)
+        return body, content_type
+    if negative is None:
+        return _download_body(url, user_agent, timeout, session, archive, max_bytes, cache, entry, deadline)
+    failed = negative.check(url)
+    if failed:
+        raise RecentlyFailed(f"{url}: {failed['kind']} ({failed['failures']}x)")
+    try:
+        result = _download_body(url, user_agent, timeout, session, archive, max_bytes, cache, entry, deadline)
+    except Exception as e:
+        kind, status = _failure_kind(e)
+        # A timeout cut short by --deadline-seconds says nothing about the URL
+        if kind and not (kind == "timeout" and timeout < time_left(None)):
+            negative.record(url, kind, status, e)
+        raise
+    negative.clear(url)
+    return result
+
+
+def fetch_html(
+    url: str,
+    user_agent: str,
+    timeout: float = 20,
+    session: Optional[requests.Session] = None,
+    archive: Optional[HtmlArchive] = None,
+    max_bytes: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+    negative: Optional[NegativeCache] = None,
+) -> str:
+    body, content_type = fetch_body(
+        url,
+        user_agent,
+        timeout=timeout,
+        session=session,
+        archive=archive,
+        max_bytes=max_bytes,
+        cache=cache,
+        negative=negative,
+    )
+    return decode_html(body, content_type)
+
+
+# Elements that never carry article text or cover candidates; dropped once right after parsing
+NOISE_TAGS = ("script", "style", "noscript", "nav", "iframe", "svg", "template")
+
+COVER_META_XPATH = (
+    '//meta[@property="og:image" or @name="og:image" or @property="twitter:image" or @name="twitter:image"]'
+    "[@content]"
+)
+COVER_IMG_XPATH = (
+    "//article//img | //main//img"
+    " | //*[contains(concat(' ', normalize-space(@class), ' '), ' article ')]//img"
+    " | //*[contains(concat(' ', normalize-space(@class), ' '), ' post ')]//img"
+)
+
+
+class _TreeDocument(Document):
+    """readability Document that hands back plain text instead of re-serialized HTML.
+
+    Also remembers a selector for the node readability picked, for template learning.
+    """
+
+    best_selector: Optional[str] = None
+
+    def get_article(self, candidates, best_candidate, html_partial=False):
+        self.best_selector = element_selector(best_candidate["elem"])
+        return super().get_article(candidates, best_candidate, html_partial=html_partial)
+
+    def get_clean_html(self) -> str:
+        return norm_space(" ".join(self.html.itertext()))
+
+
+def element_selector(elem: HtmlElement) -> Optional[str]:
+    """XPath for elem keyed on a stable id/class of elem or a close ancestor.
+
+    Positional paths are useless here: readability works on a cleaned copy and
+    rewrites tags, so the selector has to survive on the original tree.
+    """
+    suffix = ""
+    node = elem
+    for _ in range(3):
+        if node is None or not isinstance(node.tag, str):
+            return None
+        if node.tag == "body":
+            # readability stamps its own id on <body>
+            return f"//body{suffix}"
+        node_id = (node.get("id") or "").strip()
+        cls = norm_space(node.get("class") or "")
+        # Skip per-article ids like post-123456
+        if node_id and '"' not in node_id and not re.search(r"\d{3,}", node_id):
+            return f'//*[@id="{node_id}"]{suffix}'
+        if cls and '"' not in cls:
+            return f'//*[@class="{cls}"]{suffix}'
+        suffix = f"/{node.tag}{suffix}"
+        node = node.getparent()
+    return None
+
+
+def template_text(doc: HtmlElement, selector: str) -> str:
+    """Text of the single node selector matches; "" when it matches none or several."""
+    try:
+        nodes = doc.xpath(selector)
+    except etree.XPathError:
+        return ""
+    return norm_space(" ".join(nodes[0].itertext())) if len(nodes) == 1 else ""
+
+
+def same_article(node_text: str, text: str, probe: int = 100) -> bool:
+    """Whether node_text is the node readability extracted text from.
+
+    Readability drops low-scoring children, so text must be mostly contained in
+    node_text: both its ends appear there and it covers at least half of it.
+    """
+    # Compare without whitespace: readability's cleaner can merge adjacent text nodes
+    node_text, text = "".join(node_text.split()), "".join(text.split())
+    if not node_text or not text or len(text) < 0.5 * len(node_text):
+        return False
+    return text[:probe] in node_text and text[-probe:] in node_text
+
+
+def parse_html(html: str) -> HtmlElement:
+    """Parse a page once (same parser readability uses) and strip obvious noise."""
+    doc, _ = build_doc(html)
+    etree.strip_elements(doc, *NOISE_TAGS, etree.Comment, with_tail=False)
+    return doc
+
+
+def extract_readable(
+    doc: HtmlElement,
+    base_url: str,
+    template: Optional[Dict[str, Any]] = None,
+    info: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str]:
+    """Return (title, text); a learned host template is tried before full readability scoring.
+
+    ``info`` (if given) receives the method used, readability's selector, text
+    length and CPU time, which TemplateStore.observe learns from.
+    """
+    info = info if info is not None else {}
+    title = norm_space(shorten_title(doc))
+    t0 = time.process_time()
+    if template:
+        text = template_text(doc, template["selector"])
+        if len(text) >= template["min_len"]:
+            info.update(method="template", cpu_ms=(time.process_time() - t0) * 1000, text_len=len(text))
+            return title, text
+        info["template_miss"] = True
+    rd = _TreeDocument(doc)
+    text = rd.summary(html_partial=True) or ""
+    # Only learn selectors that single out readability's node on the original tree
+    selector = rd.best_selector
+    if selector and not same_article(template_text(doc, selector), text):
+        selector = None
+    info.update(
+        method="readability",
+        selector=selector,
+        cpu_ms=(time.process_time() - t0) * 1000,
+        text_len=len(text),
+    )
     return title, text
 
 
-def pick_cover_image(html: str, base_url: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "lxml")
-    # og:image
-    og = soup.select_one('meta[property="og:image"], meta[name="og:image"], meta[property="twitter:image"], meta[name="twitter:image"]')
-    if og and og.get("content"):
-        return og["content"].strip()
+def pick_cover_image(doc: HtmlElement, base_url: str) -> Optional[str]:
+    # og:image / twitter:image
+    for meta in doc.xpath(COVER_META_XPATH):
+        content = (meta.get("content") or "").strip()
+        if content:
+            return content
     # first content image
-    for img in soup.select("article img, main img, .article img, .post img"):
+    for img in doc.xpath(COVER_IMG_XPATH):
         src = img.get("src") or img.get("data-src") or img.get("data-original")
         if not src:
             continue
@@ -102,8 +634,388 @@ def pick_cover_image(html: str, base_url: str) -> Optional[str]:
     return None
 
 
-def collect(industry: str, hours: int, limit: int, sources_yaml: Path) -> Dict[str, Any]:
-    cfg = load_sources(sources_yaml)
+def cover_candidates(doc: HtmlElement, base_url: str, limit: int = 6) -> List[str]:
+    """Absolute URLs of og/twitter images and content images, in page order.
+
+    Markup width/height are not trusted here; candidates are ranked by probing
+    the real image header (scripts/utils/image_probe.py).
+    """
+    srcs = [meta.get("content") for meta in doc.xpath(COVER_META_XPATH)]
+    srcs += [img.get("src") or img.get("data-src") or img.get("data-original") for img in doc.xpath(COVER_IMG_XPATH)]
+    out: List[str] = []
+    for src in srcs:
+        src = (src or "").strip()
+        if not src or src.startswith("data:"):
+            continue
+        src = urljoin(base_url, src)
+        if src not in out:
+            out.append(src)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def extract_page(
+    html: str,
+    base_url: str,
+    template: Optional[Dict[str, Any]] = None,
+    info: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str, Optional[str]]:
+    """Return (page_title, readable_text, cover_url) from a single parse of the page."""
+    doc = parse_html(html)
+    # Cover first: readability drops hidden nodes from the tree it is given
+    cover = pick_cover_image(doc, base_url)
+    if info is not None:
+        info["cover_candidates"] = cover_candidates(doc, base_url)
+    page_title, readable = extract_readable(doc, base_url, template=template, info=info)
+    return page_title, readable, cover
+
+
+def extract_body(
+    body: bytes,
+    content_type: str,
+    base_url: str,
+    template: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, str, Optional[str], Dict[str, Any]]:
+    """Decode + extract one raw page body; returns (page_title, readable_text, cover_url, info).
+
+    Runs in the extraction worker processes, so the charset path and extraction
+    details are returned in ``info`` rather than recorded here.
+    """
+    enc, path = detect_encoding(body, content_type)
+    info: Dict[str, Any] = {"charset": path}
+    page_title, readable, cover = extract_page(body.decode(enc, errors="replace"), base_url, template, info)
+    return page_title, readable, cover, info
+
+
+class ExtractPool:
+    """CPU stage of the page pipeline: decode + extract bodies in worker processes.
+
+    submit() blocks the calling download thread once ``depth`` bodies are queued
+    or being extracted, so downloads can never run far ahead of extraction and
+    memory stays flat for large limits. ``procs=0`` extracts inline in the
+    download thread instead.
+    """
+
+    def __init__(self, procs: int, depth: int = 0):
+        self.pool: Optional[ProcessPoolExecutor] = None
+        if procs > 0:
+            # spawn: forking while download threads hold sockets/locks is not safe
+            self.pool = ProcessPoolExecutor(max_workers=procs, mp_context=multiprocessing.get_context("spawn"))
+        self.slots = threading.BoundedSemaphore(max(1, depth or 2 * procs))
+
+    def submit(
+        self,
+        body: bytes,
+        content_type: str,
+        url: str,
+        timeout: Optional[float] = None,
+        template: Optional[Dict[str, Any]] = None,
+    ) -> Future:
+        if self.pool is None:
+            fut: Future = Future()
+            try:
+                fut.set_result(extract_body(body, content_type, url, template))
+            except Exception as e:
+                fut.set_exception(e)
+            return fut
+        if not self.slots.acquire(timeout=timeout):
+            raise DeadlineExceeded(url)
+        try:
+            fut = self.pool.submit(extract_body, body, content_type, url, template)
+        except Exception:
+            self.slots.release()
+            raise
+        fut.add_done_callback(lambda _: self.slots.release())
+        return fut
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_into(
+    url: str,
+    user_agent: str,
+    extractor: ExtractPool,
+    session: Optional[requests.Session] = None,
+    deadline: Optional[float] = None,
+    archive: Optional[HtmlArchive] = None,
+    templates: Optional[TemplateStore] = None,
+    max_bytes: Optional[int] = None,
+    cache: Optional[HttpCache] = None,
+    negative: Optional[NegativeCache] = None,
+) -> Future:
+    """I/O stage: download one page and queue it for extraction; returns the extraction future."""
+    body, content_type = fetch_body(
+        url,
+        user_agent,
+        timeout=time_left(deadline),
+        session=session,
+        archive=archive,
+        max_bytes=max_bytes,
+        cache=cache,
+        negative=negative,
+        deadline=deadline,
+    )
+    template = templates.get(host_of(url)) if templates else None
+    return extractor.submit(
+        body, content_type, url, timeout=None if deadline is None else time_left(deadline), template=template
+    )
+
+
+def resolve_extraction(
+    fut: Future,
+    url: str,
+    deadline: Optional[float] = None,
+    templates: Optional[TemplateStore] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> Any:
+    """Wait for one queued extraction; returns (page_title, readable_text, cover_url, cover_candidates) or the error."""
+    try:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        page_title, readable, cover, info = fut.result(timeout=remaining)
+    except FuturesTimeout:
+        return DeadlineExceeded(url)
+    except Exception as e:
+        return e
+    with _stats_lock:
+        CHARSET_STATS[info["charset"]] += 1
+    if stats is not None:
+        if info.get("method") == "template":
+            bump(stats, "template_hits")
+        elif info.get("template_miss"):
+            bump(stats, "template_misses")
+    if templates:
+        templates.observe(host_of(url), info)
+    return page_title, readable, cover, info.get("cover_candidates") or []
+
+
+def run_bounded(
+    urls: List[str],
+    fn: Callable[[str], Any],
+    max_workers: int,
+    per_host: int,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run fn(url) for every url with a global and a per-host concurrency cap.
+
+    URLs are started in list order whenever their host has a free slot, so the
+    newest candidates are fetched first. Returns {url: result}; a failed call maps
+    to the exception it raised. If the monotonic ``deadline`` passes, calls not
+    finished by then map to DeadlineExceeded and are abandoned (not waited for).
+    """
+    results: Dict[str, Any] = {}
+    pending = list(dict.fromkeys(urls))
+    in_flight: Dict[Future, str] = {}
+    host_load: Dict[str, int] = {}
+    max_workers = max(1, max_workers)
+    per_host = max(1, per_host)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while pending or in_flight:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+
+            i = 0
+            while i < len(pending) and len(in_flight) < max_workers:
+                url = pending[i]
+                host = host_of(url)
+                if host_load.get(host, 0) >= per_host:
+                    i += 1
+                    continue
+                pending.pop(i)
+                host_load[host] = host_load.get(host, 0) + 1
+                in_flight[pool.submit(fn, url)] = url
+
+            done, _ = wait(list(in_flight), timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                url = in_flight.pop(fut)
+                host_load[host_of(url)] -= 1
+                try:
+                    results[url] = fut.result()
+                except Exception as e:
+                    results[url] = e
+    finally:
+        # On deadline, don't block on stragglers; their request timeouts are already capped
+        pool.shutdown(wait=deadline is None, cancel_futures=True)
+
+    for url in list(in_flight.values()) + pending:
+        results[url] = DeadlineExceeded(url)
+    return results
+
+
+@dataclass
+class CollectOptions:
+    """Run options for collect()/collect_many(); the *_path/*_dir stores are disabled when None."""
+
+    workers: int = 8
+    per_host: int = 2
+    skip_used: bool = False
+    reuse_extraction: bool = True
+    cluster_threshold: float = 0.4
+    cluster_reps: int = 1
+    deadline_seconds: Optional[float] = None
+    extract_procs: int = 0
+    max_html_bytes: int = 0
+    ledger_days: float = 14
+    http_cache_days: float = 14
+    state_path: Optional[Path] = None
+    ledger_path: Optional[Path] = None
+    archive_dir: Optional[Path] = None
+    templates_path: Optional[Path] = None
+    scores_path: Optional[Path] = None
+    sitemap_state_path: Optional[Path] = None
+    health_path: Optional[Path] = None
+    http_cache_dir: Optional[Path] = None
+    negative_path: Optional[Path] = None
+
+
+@dataclass
+class CollectContext:
+    """Fetch state shared by every industry collected in one process."""
+
+    cfg: dict
+    session: requests.Session
+    options: CollectOptions = field(default_factory=CollectOptions)
+    state: Optional[FeedStateStore] = None
+    ledger: Optional[SeenLedger] = None
+    archive: Optional[HtmlArchive] = None
+    extractor: Optional[ExtractPool] = None
+    templates: Optional[TemplateStore] = None
+    scores: Optional[SourceScorecard] = None
+    sitemaps: Optional[SitemapTracker] = None
+    breaker: Optional[CircuitBreaker] = None
+    http_cache: Optional[HttpCache] = None
+    negative: Optional[NegativeCache] = None
+    deadline: Optional[float] = None
+    # rss url -> parsed entries, article url -> (title, text, cover, cover candidates); fetched at most once per process
+    feeds: Dict[str, Any] = field(default_factory=dict)
+    pages: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def open(cls, sources_yaml: Path, options: Optional[CollectOptions] = None) -> "CollectContext":
+        o = options or CollectOptions()
+        cfg = load_sources(sources_yaml)
+        ua = cfg.get("global", {}).get("user_agent", "Mozilla/5.0")
+        return cls(
+            cfg=cfg,
+            session=make_session(ua, o.workers),
+            options=o,
+            state=FeedStateStore(str(o.state_path)) if o.state_path else None,
+            ledger=SeenLedger(str(o.ledger_path)) if o.ledger_path else None,
+            archive=HtmlArchive(str(o.archive_dir)) if o.archive_dir else None,
+            extractor=ExtractPool(o.extract_procs),
+            templates=TemplateStore(str(o.templates_path)) if o.templates_path else None,
+            scores=SourceScorecard(str(o.scores_path)) if o.scores_path else None,
+            sitemaps=SitemapTracker(str(o.sitemap_state_path)) if o.sitemap_state_path else None,
+            breaker=CircuitBreaker(str(o.health_path)) if o.health_path else None,
+            http_cache=HttpCache(str(o.http_cache_dir)) if o.http_cache_dir else None,
+            negative=NegativeCache(str(o.negative_path)) if o.negative_path else None,
+            deadline=time.monotonic() + o.deadline_seconds if o.deadline_seconds else None,
+        )
+
+    def close(self) -> None:
+        for store in (self.state, self.templates, self.scores, self.sitemaps, self.breaker, self.negative):
+            if store:
+                try:
+                    store.save()
+                except Exception:
+                    pass
+        if self.ledger:
+            self.ledger.prune(self.options.ledger_days)
+            self.ledger.close()
+        if self.archive:
+            self.archive.close()
+        if self.http_cache:
+            self.http_cache.close()
+            self.http_cache.prune(self.options.http_cache_days)
+        if self.extractor:
+            self.extractor.close()
+        self.session.close()
+
+
+def collect(
+    industry: str,
+    hours: int,
+    limit: int,
+    sources_yaml: Path,
+    options: Optional[CollectOptions] = None,
+    ctx: Optional[CollectContext] = None,
+    writer: Optional[JsonlPayloadWriter] = None,
+) -> Dict[str, Any]:
+    """Collect one industry; with a writer, items are streamed to it and left out of the payload.
+
+    With a ctx, its options apply and ``options`` is ignored.
+    """
+    own_ctx = ctx is None
+    if ctx is None:
+        ctx = CollectContext.open(sources_yaml, options)
+    try:
+        return _collect(industry, hours, limit, ctx, writer)
+    finally:
+        if own_ctx:
+            ctx.close()
+
+
+def collect_many(
+    industries: List[str],
+    hours: int,
+    limit: int,
+    sources_yaml: Path,
+    options: Optional[CollectOptions] = None,
+    writers: Optional[Dict[str, JsonlPayloadWriter]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Collect several industries in one process; returns {industry: payload}.
+
+    Industries with an entry in ``writers`` stream their items to it (see collect).
+    """
+    ctx = CollectContext.open(sources_yaml, options)
+    payloads: Dict[str, Dict[str, Any]] = {}
+    try:
+        for industry in industries:
+            payloads[industry] = _collect(industry, hours, limit, ctx, (writers or {}).get(industry))
+    finally:
+        ctx.close()
+    return payloads
+
+
+def _fresh_count(candidates: List[Tuple[datetime, str, str, str, str]], ledger: Optional[SeenLedger]) -> int:
+    """Distinct candidate URLs, minus those already cited in a post when a ledger is given."""
+    urls = {c[3] for c in candidates}
+    if ledger:
+        urls -= {u for u, row in ledger.get_many(urls).items() if row.get("used_in_post")}
+    return len(urls)
+
+
+def _representatives(group: List[int], entries: List[Tuple[datetime, str, str, str, str]], n: int) -> List[int]:
+    """Up to n members of a cluster: the newest first, then the newest from sources not yet picked."""
+    picked = [group[0]]
+    for i in group[1:]:
+        if len(picked) >= n:
+            break
+        if entries[i][1] not in {entries[j][1] for j in picked}:
+            picked.append(i)
+    return picked
+
+
+def _collect(
+    industry: str,
+    hours: int,
+    limit: int,
+    ctx: CollectContext,
+    writer: Optional[JsonlPayloadWriter] = None,
+) -> Dict[str, Any]:
+    cfg, o = ctx.cfg, ctx.options
+    workers, per_host, skip_used, reuse_extraction = o.workers, o.per_host, o.skip_used, o.reuse_extraction
+    cluster_threshold, cluster_reps = o.cluster_threshold, o.cluster_reps
+    charset_before = Counter(CHARSET_STATS)
+    http_cache_before = Counter(ctx.http_cache.stats) if ctx.http_cache else Counter()
+    negative_before = Counter(ctx.negative.stats) if ctx.negative else Counter()
+    download_before = Counter(DOWNLOAD_STATS)
+    session, state, ledger, deadline = ctx.session, ctx.state, ctx.ledger, ctx.deadline
     ua = cfg.get("global", {}).get("user_agent", "Mozilla/5.0")
     feeds = cfg.get("industries", {}).get(industry, [])
     if not feeds:
@@ -114,98 +1026,521 @@ def collect(industry: str, hours: int, limit: int, sources_yaml: Path) -> Dict[s
     candidates: List[Tuple[datetime, str, str, str, str]] = []
     # (published_dt, source, title, url, summary)
 
-    for f in feeds:
-        name = f.get("name")
-        rss = f.get("rss")
-        if not rss:
-            continue
+    feed_stats: Dict[str, int] = {"fetched": 0, "not_modified": 0, "failed": 0, "bytes": 0, "shared": 0}
+
+    feed_urls = {f["rss"]: f.get("name") for f in feeds if f.get("rss")}
+    # Sources without RSS can list a sitemap instead; only new/changed URLs come back from it
+    sitemap_cfg = {f["sitemap"]: f for f in feeds if f.get("sitemap") and not f.get("rss")}
+    if ctx.sitemaps:
+        feed_urls.update({u: f.get("name") for u, f in sitemap_cfg.items()})
+    scores = ctx.scores
+    # High-yield sources are fetched first; proven low-yield ones only if the rest come up short
+    # (or when their daily exploration fetch is due, see SourceScorecard.is_low_yield)
+    primary = list(feed_urls)
+    deferred: List[str] = []
+    if scores:
+        primary.sort(key=lambda u: -scores.score(feed_urls[u]))
+        deferred = [u for u in primary if scores.is_low_yield(feed_urls[u])]
+        primary = [u for u in primary if u not in deferred]
+    source_stats = {"deferred": len(deferred), "deferred_fetched": 0}
+
+    feed_latency: Dict[str, float] = {}
+    fetched_feeds: List[str] = []
+
+    breaker = ctx.breaker
+
+    def timed_feed(u: str) -> List[Dict[str, Any]]:
+        # An open breaker skips the source outright instead of waiting out its timeout
+        if breaker and not breaker.allow(u):
+            raise CircuitOpen(u)
+        t0 = time.monotonic()
+        timeout = time_left(deadline)
         try:
-            # Some feeds block non-browser UAs when fetched by feedparser directly.
-            # Fetch via requests with UA first, then let feedparser parse the content.
-            resp = requests.get(rss, headers={"User-Agent": ua}, timeout=20)
-            resp.raise_for_status()
-            parsed = feedparser.parse(resp.content)
-            for e in parsed.entries[: max(limit, 20)]:
-                url = getattr(e, "link", None)
+            if u in sitemap_cfg:
+                bump(feed_stats, "sitemaps")
+                entries = ctx.sitemaps.discover(
+                    u,
+                    session,
+                    max(limit, 20),
+                    match=sitemap_cfg[u].get("match"),
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+            else:
+                entries = fetch_feed_entries(
+                    u,
+                    session,
+                    max(limit, 20),
+                    state=state,
+                    stats=feed_stats,
+                    timeout=timeout,
+                    cutoff=cutoff,
+                    deadline=deadline,
+                )
+        except DeadlinePassed as e:
+            raise DeadlineExceeded(u) from e
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            # A timeout cut short by --deadline-seconds says nothing about the source
+            if breaker and not (isinstance(e, requests.Timeout) and timeout < time_left(None)):
+                breaker.record_failure(u, e)
+            raise
+        finally:
+            feed_latency[u] = (time.monotonic() - t0) * 1000
+        if breaker:
+            breaker.record_success(u)
+        return entries
+
+    cut_sources: List[str] = []
+    fresh_by_source: Counter = Counter()
+    for tier in (primary, deferred):
+        if not tier:
+            continue
+        if tier is deferred:
+            if _fresh_count(candidates, ledger if skip_used else None) >= limit:
+                break
+            source_stats["deferred_fetched"] = len(deferred)
+        to_fetch_feeds = [u for u in tier if u not in ctx.feeds]
+        feed_stats["shared"] += len(tier) - len(to_fetch_feeds)
+        fetched_feeds += to_fetch_feeds
+        ctx.feeds.update(
+            run_bounded(to_fetch_feeds, timed_feed, max_workers=workers, per_host=per_host, deadline=deadline)
+        )
+
+        for rss in tier:
+            name = feed_urls[rss]
+            entries = ctx.feeds.get(rss)
+            if isinstance(entries, DeadlineExceeded):
+                cut_sources.append(name)
+                continue
+            if isinstance(entries, CircuitOpen):
+                bump(feed_stats, "breaker_skipped")
+                continue
+            if not isinstance(entries, list):
+                feed_stats["failed"] += 1
+                continue
+            for e in entries:
+                url = e.get("url")
                 if not url:
                     continue
-                published_dt = parse_published(e) or datetime.now(timezone.utc)
+                published_dt = (
+                    datetime.fromisoformat(e["published"]) if e.get("published") else datetime.now(timezone.utc)
+                )
                 if published_dt < cutoff:
                     continue
-                title = norm_space(getattr(e, "title", ""))
-                summary = norm_space(getattr(e, "summary", ""))
-                candidates.append((published_dt, name, title, url, summary))
-        except Exception:
-            continue
+                fresh_by_source[name] += 1
+                candidates.append((published_dt, name, e.get("title") or "", url, e.get("summary") or ""))
 
-    # sort by recency
+    # sort by recency; ties keep the configured source order
+    config_pos = {name: i for i, name in enumerate(feed_urls.values())}
+    candidates.sort(key=lambda x: config_pos.get(x[1], 0))
     candidates.sort(key=lambda x: x[0], reverse=True)
 
     seen = set()
-    items: List[NewsItem] = []
-
-    for published_dt, source, title, url, summary in candidates:
-        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    unique: List[Tuple[datetime, str, str, str, str]] = []
+    for c in candidates:
+        key = url_hash(c[3])
         if key in seen:
             continue
         seen.add(key)
-        # Try to fetch full article text; if blocked/timeout, fall back to RSS summary
-        page_title = title
-        readable = summary
-        cover = None
-        try:
-            html = fetch_html(url, ua)
-            page_title, readable = extract_readable(html, url)
-            cover = pick_cover_image(html, url)
-        except Exception:
-            # Keep RSS-based content so we can still publish instead of producing 0 items
-            pass
+        unique.append(c)
 
-        # Skip entries that are completely empty
-        if not norm_space(page_title) and not norm_space(readable):
-            continue
+    known = ledger.get_many([c[3] for c in unique]) if ledger else {}
+    ledger_stats = {"reused": 0, "recorded": 0, "skipped_used": 0}
+    page_stats = {"fetched": 0, "shared": 0, "negative_cached": 0, "template_hits": 0, "template_misses": 0}
+    if skip_used:
+        before = len(unique)
+        unique = [c for c in unique if not (known.get(c[3]) or {}).get("used_in_post")]
+        ledger_stats["skipped_used"] = before - len(unique)
 
-        items.append(
-            NewsItem(
-                industry=industry,
-                source=source,
-                title=page_title or title,
-                url=url,
-                published=published_dt.isoformat(),
-                summary=(summary or "")[:4000],
-                content_text=(readable or "")[:16000],
-                cover_image_url=cover,
-            )
+    # Same story from several feeds: fetch only the cluster representatives, cite the rest
+    related: Dict[str, List[Dict[str, Any]]] = {}
+    cluster_stats = {"entries": len(unique), "clusters": len(unique), "merged": 0}
+    if cluster_threshold and unique:
+        groups = cluster_entries([shingles(c[2], c[4]) for c in unique], cluster_threshold, [c[1] for c in unique])
+        keep: List[int] = []
+        for group in groups:
+            reps = _representatives(group, unique, cluster_reps)
+            keep += reps
+            rest = [unique[i] for i in group if i not in reps]
+            if rest:
+                related[unique[reps[0]][3]] = [
+                    {"source": r[1], "title": r[2], "url": r[3], "published": r[0].isoformat()} for r in rest
+                ]
+        unique = [unique[i] for i in sorted(keep)]
+        cluster_stats.update(clusters=len(groups), merged=cluster_stats["entries"] - len(unique))
+
+    pages_by_source: Dict[str, Counter] = {}
+    # Without a writer items are kept for the returned payload
+    items: List[Dict[str, Any]] = []
+    emit = writer.add if writer else items.append
+    emitted: List[str] = []
+    cut_pages: Dict[str, int] = {}
+    pos = 0
+
+    # Fetch in recency-ordered batches just large enough to fill the remaining slots;
+    # only entries that turn out completely empty cause another (small) batch.
+    while pos < len(unique) and len(emitted) < limit:
+        batch = unique[pos : pos + (limit - len(emitted))]
+        pos += len(batch)
+        pages: Dict[str, Any] = {}
+        to_fetch: List[str] = []
+        for c in batch:
+            row = known.get(c[3])
+            if isinstance(ctx.pages.get(c[3]), tuple):
+                pages[c[3]] = ctx.pages[c[3]]
+                page_stats["shared"] += 1
+            elif reuse_extraction and row and row.get("content_text"):
+                cover = row.get("cover_image_url")
+                pages[c[3]] = (row.get("title") or "", row["content_text"], cover, [cover] if cover else [])
+                ledger_stats["reused"] += 1
+            else:
+                to_fetch.append(c[3])
+        # Download threads queue bodies for the extraction processes and move on to the next URL
+        queued = run_bounded(
+            to_fetch,
+            lambda u: fetch_into(
+                u,
+                ua,
+                ctx.extractor,
+                session=session,
+                deadline=deadline,
+                archive=ctx.archive,
+                templates=ctx.templates,
+                max_bytes=o.max_html_bytes or None,
+                cache=ctx.http_cache,
+                negative=ctx.negative,
+            ),
+            max_workers=workers,
+            per_host=per_host,
+            deadline=deadline,
         )
-        if len(items) >= limit:
-            break
+        fetched = {
+            url: resolve_extraction(r, url, deadline, templates=ctx.templates, stats=page_stats)
+            if isinstance(r, Future)
+            else r
+            for url, r in queued.items()
+        }
+        pages.update(fetched)
+        page_stats["fetched"] += len(to_fetch)
+        for url, page in fetched.items():
+            if not isinstance(page, tuple):
+                continue
+            ctx.pages[url] = page
+            if ledger and page[1]:
+                ledger.record(url, page[0], page[1][:16000], page[2])
+                ledger_stats["recorded"] += 1
+
+        for published_dt, source, title, url, summary in batch:
+            # If blocked/timeout/past the deadline, fall back to RSS summary so we can still
+            # publish instead of producing 0 items
+            page_title = title
+            readable = summary
+            cover = None
+            cover_cands: List[str] = []
+            page = pages.get(url)
+            outcome = pages_by_source.setdefault(source, Counter())
+            if isinstance(page, tuple):
+                page_title, readable, cover, cover_cands = page
+                if url in fetched:
+                    outcome["ok" if readable else "failed"] += 1
+            elif isinstance(page, DeadlineExceeded):
+                cut_pages[source] = cut_pages.get(source, 0) + 1
+            elif isinstance(page, RecentlyFailed):
+                # Already counted against the source when it failed
+                bump(page_stats, "negative_cached")
+            elif page is not None:
+                outcome["failed"] += 1
+
+            # Skip entries that are completely empty
+            if not norm_space(page_title) and not norm_space(readable):
+                continue
+
+            emit(
+                asdict(
+                    NewsItem(
+                        industry=industry,
+                        source=source,
+                        title=page_title or title,
+                        url=url,
+                        published=published_dt.isoformat(),
+                        summary=(summary or "")[:4000],
+                        content_text=(readable or "")[:16000],
+                        cover_image_url=cover,
+                        cover_candidates=cover_cands,
+                        related=related.get(url, []),
+                    )
+                )
+            )
+            emitted.append(url)
+            outcome["emitted"] += 1
+            if len(emitted) >= limit:
+                break
+
+    if ledger:
+        ledger.touch(emitted)
+    if scores:
+        for rss in fetched_feeds:
+            if isinstance(ctx.feeds.get(rss), (DeadlineExceeded, CircuitOpen)):
+                continue
+            name = feed_urls[rss]
+            scores.record_feed(name, fresh_by_source[name], feed_latency.get(rss))
+        for name, outcome in pages_by_source.items():
+            scores.record_pages(name, outcome["ok"], outcome["failed"], outcome["emitted"])
 
     payload = {
         "industry": industry,
         "collected_at": datetime.now(timezone.utc).isoformat(),
         "hours": hours,
         "limit": limit,
-        "count": len(items),
-        "items": [asdict(x) for x in items],
+        "count": len(emitted),
+        "meta": {
+            "feeds": feed_stats,
+            "pages": page_stats,
+            "ledger": ledger_stats,
+            "sources": source_stats,
+            "clusters": cluster_stats,
+            "charset": dict(CHARSET_STATS - charset_before),
+            "download": dict(DOWNLOAD_STATS - download_before),
+        },
     }
+    if ctx.templates:
+        payload["meta"]["templates"] = ctx.templates.summary()
+    if breaker:
+        payload["meta"]["health"] = breaker.snapshot(feed_urls)
+    if ctx.http_cache:
+        payload["meta"]["http_cache"] = dict(ctx.http_cache.stats - http_cache_before)
+    if ctx.negative:
+        payload["meta"]["negative_cache"] = dict(ctx.negative.stats - negative_before)
+    if deadline is not None:
+        payload["meta"]["deadline"] = {
+            "expired": time.monotonic() >= deadline,
+            # feeds not fetched in time, and sources whose pages fell back to the RSS summary
+            "cut_sources": cut_sources,
+            "cut_pages": cut_pages,
+        }
+    if writer is None:
+        payload["items"] = items
     return payload
 
 
+def _replay_one(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-extract one archived body (runs in a worker process)."""
+    out = {"url": rec["url"], "fetched_at": rec["fetched_at"], "digest": rec["digest"]}
+    t0 = time.process_time()
+    try:
+        title, text, cover, _ = extract_body(read_object(rec["path"]), rec.get("content_type") or "", rec["url"])
+        out.update({"title": title, "cover_image_url": cover, "content_text": text[:16000]})
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["cpu_ms"] = round((time.process_time() - t0) * 1000, 2)
+    return out
+
+
+def replay(archive_dir: Path, workers: int = 0, since_hours: float = 0) -> Dict[str, Any]:
+    """Re-run extraction over the latest archived body of every URL, without network access."""
+    archive = HtmlArchive(str(archive_dir))
+    records = archive.latest(time.time() - since_hours * 3600 if since_hours else None)
+    archive.close()
+
+    t0 = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(pool.map(_replay_one, records, chunksize=8))
+    return {
+        "archive": str(archive_dir),
+        "replayed_at": datetime.now(timezone.utc).isoformat(),
+        "count": len(results),
+        "failed": sum(1 for r in results if "error" in r),
+        "wall_s": round(time.monotonic() - t0, 3),
+        "cpu_ms_total": round(sum(r["cpu_ms"] for r in results), 2),
+        "items": results,
+    }
+
+
+def write_payload(payload: Dict[str, Any], out_path: Path, writer: Optional[JsonlPayloadWriter] = None) -> None:
+    """Write the payload (format by suffix), or finish a streamed one by adding its header line."""
+    if writer is not None:
+        writer.finish(payload)
+    else:
+        write_payload_file(payload, out_path)
+    print(f"✅ collected {payload['count']} items -> {out_path}")
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--industry", required=True)
+    ap.add_argument("--industry", help="Single industry to collect (writes --out)")
+    ap.add_argument(
+        "--industries",
+        help="Batch mode: comma-separated industries or 'all'; writes <out-dir>/news_<industry>.<format>",
+    )
     ap.add_argument("--hours", type=int, default=24)
     ap.add_argument("--limit", type=int, default=20)
-    ap.add_argument("--out", required=True)
+    ap.add_argument("--out", help="Output path; a .jsonl suffix streams items as they complete")
+    ap.add_argument("--out-dir", default="data/raw/batch")
+    ap.add_argument("--format", choices=["json", "jsonl"], default="json", help="Batch mode output format")
     ap.add_argument("--sources", default="scripts/news_sources.yaml")
+    ap.add_argument("--workers", type=int, default=8, help="Max concurrent article page fetches")
+    ap.add_argument("--per-host", type=int, default=2, help="Max concurrent fetches against a single host")
+    ap.add_argument(
+        "--feed-state",
+        default="data/cache/feed_state.json",
+        help="ETag/Last-Modified store for conditional feed requests (empty to disable)",
+    )
+    ap.add_argument(
+        "--ledger",
+        default="data/cache/seen_urls.sqlite",
+        help="Seen-URL ledger reused across runs (empty to disable)",
+    )
+    ap.add_argument("--ledger-days", type=float, default=14, help="Prune ledger rows not seen for this many days")
+    ap.add_argument("--skip-used", action="store_true", help="Drop URLs already cited by a generated post")
+    ap.add_argument("--refetch", action="store_true", help="Refetch pages even if the ledger has their extraction")
+    ap.add_argument(
+        "--deadline-seconds",
+        type=float,
+        default=0,
+        help="Hard time budget for the run; unfinished fetches are abandoned and ready items emitted (0 = none)",
+    )
+    ap.add_argument(
+        "--extract-procs",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Extraction worker processes fed by the download threads (0 = extract in the download threads)",
+    )
+    ap.add_argument(
+        "--templates",
+        default="data/cache/extract_templates.json",
+        help="Per-host learned extraction templates with hit/miss stats (empty to disable)",
+    )
+    ap.add_argument(
+        "--sitemap-state",
+        default="data/cache/sitemap_state.json",
+        help="lastmod/seen-URL state for sitemap sources (empty disables sitemap sources)",
+    )
+    ap.add_argument(
+        "--health",
+        default="data/cache/source_health.json",
+        help="Per-feed circuit breaker state; failing feeds are skipped until a periodic probe (empty to disable)",
+    )
+    ap.add_argument(
+        "--cluster-threshold",
+        type=float,
+        default=0.4,
+        help="Jaccard similarity at which feed entries count as the same story (0 = no clustering)",
+    )
+    ap.add_argument("--cluster-reps", type=int, default=1, help="Pages fetched per story cluster")
+    ap.add_argument(
+        "--scores",
+        default="data/cache/source_scores.json",
+        help="Per-source yield scorecard; orders feed fetches and defers low-yield feeds (empty to disable)",
+    )
+    ap.add_argument(
+        "--max-html-bytes",
+        type=int,
+        default=0,
+        help="Stop reading a page after this many bytes (default: per-type cap in scripts/utils/capped_download.py)",
+    )
+    ap.add_argument(
+        "--http-cache",
+        default="data/cache/http",
+        help="Page cache honoring Cache-Control/Expires, validators and stale-while-revalidate (empty to disable)",
+    )
+    ap.add_argument(
+        "--http-cache-days",
+        type=float,
+        default=14,
+        help="Prune page cache entries that have been stale for this many days",
+    )
+    ap.add_argument(
+        "--negative-cache",
+        default="data/cache/negative_urls.json",
+        help="Recently failed page URLs, skipped until their status-dependent TTL expires (empty to disable)",
+    )
+    ap.add_argument("--archive", default="", help="Store fetched page bodies in this archive directory")
+    ap.add_argument("--replay", default="", help="Re-run extraction over an archive directory instead of fetching")
+    ap.add_argument("--replay-since-hours", type=float, default=0, help="Only replay bodies fetched this recently")
+    ap.add_argument("--replay-workers", type=int, default=0, help="Replay process pool size (default: CPU count)")
     args = ap.parse_args()
+    if install_from_env() == "replay":
+        # Replay misses must not land in the real breaker/negative-cache/validator state
+        for name in (
+            "feed_state",
+            "ledger",
+            "templates",
+            "sitemap_state",
+            "health",
+            "scores",
+            "http_cache",
+            "negative_cache",
+        ):
+            setattr(args, name, state_path(getattr(args, name)))
 
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if args.replay:
+        if not args.out:
+            ap.error("--out is required with --replay")
+        result = replay(Path(args.replay), args.replay_workers, args.replay_since_hours)
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(
+            f"✅ replayed {result['count']} pages ({result['failed']} failed) in {result['wall_s']}s "
+            f"cpu={result['cpu_ms_total']}ms -> {args.out}"
+        )
+        return
 
-    payload = collect(args.industry, args.hours, args.limit, Path(args.sources))
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"✅ collected {payload['count']} items -> {out_path}")
+    if bool(args.industry) == bool(args.industries):
+        ap.error("pass exactly one of --industry or --industries")
+    if args.industry and not args.out:
+        ap.error("--out is required with --industry")
+
+    opts = CollectOptions(
+        workers=args.workers,
+        per_host=args.per_host,
+        state_path=Path(args.feed_state) if args.feed_state else None,
+        ledger_path=Path(args.ledger) if args.ledger else None,
+        ledger_days=args.ledger_days,
+        skip_used=args.skip_used,
+        reuse_extraction=not args.refetch,
+        cluster_threshold=args.cluster_threshold,
+        cluster_reps=max(1, args.cluster_reps),
+        deadline_seconds=args.deadline_seconds or None,
+        archive_dir=Path(args.archive) if args.archive else None,
+        extract_procs=args.extract_procs,
+        templates_path=Path(args.templates) if args.templates else None,
+        max_html_bytes=args.max_html_bytes,
+        scores_path=Path(args.scores) if args.scores else None,
+        sitemap_state_path=Path(args.sitemap_state) if args.sitemap_state else None,
+        health_path=Path(args.health) if args.health else None,
+        http_cache_dir=Path(args.http_cache) if args.http_cache else None,
+        http_cache_days=args.http_cache_days,
+        negative_path=Path(args.negative_cache) if args.negative_cache else None,
+    )
+
+    if args.industry:
+        out_path = Path(args.out)
+        writer = JsonlPayloadWriter(out_path) if is_jsonl(out_path) else None
+        try:
+            payload = collect(args.industry, args.hours, args.limit, Path(args.sources), opts, writer=writer)
+        except BaseException:
+            if writer:
+                writer.abort()
+            raise
+        write_payload(payload, out_path, writer)
+        return
+
+    if args.industries.strip() == "all":
+        industries = list((load_sources(Path(args.sources)).get("industries") or {}).keys())
+    else:
+        industries = [x.strip() for x in args.industries.split(",") if x.strip()]
+    out_paths = {ind: Path(args.out_dir) / f"news_{ind}.{args.format}" for ind in industries}
+    writers = {ind: JsonlPayloadWriter(p) for ind, p in out_paths.items() if args.format == "jsonl"}
+    try:
+        payloads = collect_many(industries, args.hours, args.limit, Path(args.sources), opts, writers=writers)
+    except BaseException:
+        for w in writers.values():
+            w.abort()
+        raise
+    for industry, payload in payloads.items():
+        write_payload(payload, out_paths[industry], writers.get(industry))
 
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import time
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -17,13 +18,53 @@ from bs4 import BeautifulSoup
 import httpx
 from urllib.parse import urljoin, urlparse
 import hashlib
+import importlib.util
+from contextlib import asynccontextmanager
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger import setup_logger
-from scripts.utils.cache import CacheManager
+from scripts.utils.async_cache import AsyncHttpCache, AsyncMarkerSet
+from scripts.utils.cache import CacheManager, MarkerSet
+from scripts.utils.http_cache import FRESH, STALE_REVALIDATE, HttpCache
+from scripts.utils.negative_cache import NegativeCache, classify
+from scripts.utils.rate_limiter import HostRateLimiter
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+# httpx只在对应可选依赖存在时才能解码br/zstd、协商HTTP/2
+ACCEPT_ENCODING = ', '.join(
+    ['gzip', 'deflate']
+    + (['br'] if _has_module('brotli') or _has_module('brotlicffi') else [])
+    + (['zstd'] if _has_module('zstandard') else [])
+)
+HTTP2_AVAILABLE = _has_module('h2')
+
+
+def create_async_client(config: Dict[str, Any]) -> httpx.AsyncClient:
+    """
+    创建采集器共享的长连接客户端（HTTP/2、连接池、keep-alive）
+    
+    由CollectorRunner持有并在cleanup()中关闭；参数可在config的collectors.http下覆盖
+    """
+    collectors = config.get('collectors', {})
+    http_cfg = collectors.get('http', {})
+    limits = httpx.Limits(
+        max_connections=http_cfg.get('max_connections', 50),
+        max_keepalive_connections=http_cfg.get('max_keepalive_connections', 20),
+        keepalive_expiry=http_cfg.get('keepalive_expiry', 30),
+    )
+    return httpx.AsyncClient(
+        http2=http_cfg.get('http2', True) and HTTP2_AVAILABLE,
+        limits=limits,
+        timeout=collectors.get('timeout', 30),
+        headers={'Accept-Encoding': ACCEPT_ENCODING},
+    )
 
 
 class BaseCollector(ABC):
@@ -50,31 +91,86 @@ class BaseCollector(ABC):
         # 初始化缓存
         cache_dir = config.get('storage', {}).get('cache_dir', './data/cache')
         self.cache = CacheManager(cache_dir, prefix=f"collector_{self.source_name}")
+        # 页面缓存遵循响应的Cache-Control/Expires与验证头（与collect_news.py共用目录）；
+        # 响应完全没有过期信息时才按数据源的update_interval缓存
+        self.http_cache = HttpCache(os.path.join(cache_dir, 'http'),
+                                    default_ttl=source_config.get('update_interval', 3600))
+        self._revalidations = set()
+        # 去重标记（24小时）集中在一个文件中，批量判定只读写一次
+        self.duplicates = MarkerSet(os.path.join(cache_dir, f'collector_{self.source_name}_duplicates.json'),
+                                    ttl=86400)
+        # 事件循环中通过异步门面访问缓存，磁盘读写和序列化在工作线程执行
+        self.async_duplicates = AsyncMarkerSet(self.duplicates)
+        self.async_http_cache = AsyncHttpCache(self.http_cache)
+        # 近期失败（404/403/超时/5xx）的URL在屏蔽期内直接返回None，不再等待超时（与collect_news.py共用文件）
+        self.negative_cache = NegativeCache(os.path.join(cache_dir, 'negative_urls.json'))
         
-        # HTTP客户端配置
+        # HTTP客户端配置；client由CollectorRunner注入共享的长连接客户端，为空时每次请求临时建立
+        self.client: Optional[httpx.AsyncClient] = None
+        # 按主机限速（可选）：只约束真正发出的请求，缓存命中不消耗令牌
+        self.rate_limiter: Optional[HostRateLimiter] = None
         self.timeout = config.get('collectors', {}).get('timeout', 30)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': ACCEPT_ENCODING,
         }
         
         # 采集参数
         self.max_articles = config.get('collectors', {}).get('parameters', {}).get('max_articles_per_source', 20)
         self.min_content_length = config.get('collectors', {}).get('parameters', {}).get('min_content_length', 100)
+        # 单个采集器内的文章并发数与同一主机的并发上限
+        self.concurrency = config.get('collectors', {}).get('parameters', {}).get('article_concurrency', 6)
+        self.per_host = config.get('collectors', {}).get('parameters', {}).get('per_host_concurrency', 2)
         
         # 统计信息
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
+            'cache_hits': 0,
+            'cache_revalidated': 0,
+            'negative_cache_hits': 0,
+            'negative_cached': 0,
             'articles_collected': 0,
             'articles_filtered': 0,
             'last_collection_time': None,
             'collection_duration': 0
         }
     
+    @asynccontextmanager
+    async def _http(self):
+        """共享客户端存在时复用其连接池，否则临时建立（单独使用采集器时）"""
+        if self.client is not None:
+            yield self.client
+            return
+        async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
+            yield client
+    
+    async def gather_bounded(self, urls: List[str], fetch) -> List[Any]:
+        """
+        并发执行fetch(url)，总并发不超过self.concurrency、同一主机不超过self.per_host
+        
+        Args:
+            urls: URL列表
+            fetch: 协程函数
+            
+        Returns:
+            与urls顺序一致的结果列表，失败的位置为对应的异常
+        """
+        limit = asyncio.Semaphore(max(1, self.concurrency))
+        hosts: Dict[str, asyncio.Semaphore] = {}
+        
+        async def run(url: str):
+            host = hosts.setdefault(urlparse(url).hostname or '', asyncio.Semaphore(max(1, self.per_host)))
+            # 先占主机名额再占全局名额，避免同一主机的排队请求占满全局并发
+            async with host:
+                async with limit:
+                    return await fetch(url)
+        
+        return await asyncio.gather(*[run(u) for u in urls], return_exceptions=True)
+    
     @abstractmethod
     async def collect(self) -> List[Dict[str, Any]]:
         """
@@ -92,6 +188,10 @@ class BaseCollector(ABC):
         """
         获取URL内容
         
+        GET响应按HTTP缓存语义缓存：新鲜的直接返回；处于stale-while-revalidate窗口的
+        先返回旧内容并在后台验证；其余带If-None-Match/If-Modified-Since请求，304时沿用缓存。
+        GET失败（404/410/403、超时、5xx、连接错误）记入负缓存，屏蔽期内直接返回None。
+        
         Args:
             url: 目标URL
             method: HTTP方法
@@ -102,56 +202,120 @@ class BaseCollector(ABC):
         Returns:
             响应内容或None
         """
-        # 生成缓存键
-        cache_key = hashlib.md5(f"{url}_{method}_{str(params)}_{str(data)}".encode()).hexdigest()
+        request_url = str(httpx.URL(url, params=params)) if params else url
+        cacheable = use_cache and method.upper() == 'GET'
+        entry = await self.async_http_cache.lookup(request_url) if cacheable else None
+        if entry and entry['state'] in (FRESH, STALE_REVALIDATE):
+            self.stats['cache_hits'] += 1
+            if entry['state'] == STALE_REVALIDATE and self.async_http_cache.begin_revalidation(request_url):
+                task = asyncio.create_task(self._revalidate(request_url, entry))
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidations.discard)
+            self.logger.debug(f"从缓存获取: {url}")
+            return self._cached_text(entry)
         
-        # 检查缓存
-        if use_cache:
-            cached = self.cache.get(cache_key)
-            if cached:
-                self.logger.debug(f"从缓存获取: {url}")
-                return cached
+        if cacheable:
+            failed = self.negative_cache.check(request_url)
+            if failed:
+                self.stats['negative_cache_hits'] += 1
+                self.logger.debug(f"近期失败，跳过请求: {url} - {failed['kind']}")
+                return None
         
         try:
             self.stats['total_requests'] += 1
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(url)
             start_time = time.time()
             
-            async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
+            async with self._http() as client:
+                headers = {**self.headers, **HttpCache.conditional_headers(entry)}
                 if method.upper() == 'GET':
-                    response = await client.get(url, params=params)
+                    response = await client.get(url, params=params, headers=headers, timeout=self.timeout)
                 elif method.upper() == 'POST':
-                    response = await client.post(url, params=params, data=data)
+                    response = await client.post(url, params=params, data=data, headers=self.headers,
+                                                 timeout=self.timeout)
                 else:
                     raise ValueError(f"不支持的HTTP方法: {method}")
                 
+                if response.status_code == 304 and entry:
+                    self.stats['successful_requests'] += 1
+                    self.stats['cache_revalidated'] += 1
+                    entry = await self.async_http_cache.refresh(request_url, entry, response.headers.multi_items())
+                    return self._cached_text(entry)
+                
                 response.raise_for_status()
                 
                 # 记录成功
                 self.stats['successful_requests'] += 1
+                if cacheable:
+                    self.negative_cache.clear(request_url)
                 duration = time.time() - start_time
                 self.logger.debug(f"获取成功: {url} - 状态码: {response.status_code} - 耗时: {duration:.2f}s")
                 
                 content = response.text
                 
-                # 保存到缓存
-                if use_cache:
-                    cache_ttl = self.source_config.get('update_interval', 3600)
-                    self.cache.set(cache_key, content, ttl=cache_ttl)
+                # 保存到缓存（no-store等不可缓存的响应不会写入）
+                if cacheable:
+                    await self.async_http_cache.store(request_url, response.status_code,
+                                                      response.headers.multi_items(), response.content)
                 
                 return content
                 
-        except httpx.TimeoutException:
+        except httpx.TimeoutException as e:
             self.stats['failed_requests'] += 1
             self.logger.warning(f"请求超时: {url}")
+            if cacheable:
+                self._record_failure(request_url, 'timeout', error=e)
         except httpx.HTTPStatusError as e:
             self.stats['failed_requests'] += 1
             self.logger.warning(f"HTTP错误: {url} - 状态码: {e.response.status_code}")
+            kind = classify(e.response.status_code)
+            if cacheable and kind:
+                self._record_failure(request_url, kind, e.response.status_code, e)
+        except httpx.TransportError as e:
+            self.stats['failed_requests'] += 1
+            self.logger.error(f"请求失败: {url} - 错误: {str(e)}")
+            if cacheable:
+                self._record_failure(request_url, 'error', error=e)
         except Exception as e:
             self.stats['failed_requests'] += 1
             self.logger.error(f"请求失败: {url} - 错误: {str(e)}")
         
         return None
     
+    def _record_failure(self, url: str, kind: str, status: Optional[int] = None, error: Any = None):
+        ttl = self.negative_cache.record(url, kind, status, error)
+        self.stats['negative_cached'] += 1
+        self.logger.debug(f"记入负缓存: {url} - {kind} - {ttl:.0f}s内不再请求")
+    
+    @staticmethod
+    def _cached_text(entry: Dict[str, Any]) -> str:
+        """按缓存的Content-Type解码，与httpx的response.text一致"""
+        return httpx.Response(entry['status'], headers=entry['headers'], content=entry['body']).text
+    
+    async def _revalidate(self, url: str, entry: Dict[str, Any]):
+        """后台验证一个stale-while-revalidate条目"""
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(url)
+            async with self._http() as client:
+                response = await client.get(url, headers={**self.headers, **HttpCache.conditional_headers(entry)},
+                                            timeout=self.timeout)
+            if response.status_code == 304:
+                await self.async_http_cache.refresh(url, entry, response.headers.multi_items())
+            elif response.status_code < 400:
+                await self.async_http_cache.store(url, response.status_code, response.headers.multi_items(),
+                                                  response.content)
+        except Exception as e:
+            self.logger.debug(f"后台验证失败: {url} - {e}")
+        finally:
+            self.async_http_cache.end_revalidation(url)
+    
+    async def wait_revalidations(self):
+        """等待后台缓存验证完成（事件循环结束前调用）"""
+        if self._revalidations:
+            await asyncio.gather(*list(self._revalidations), return_exceptions=True)
+    
     def parse_html(self, html: str, url: str = '') -> BeautifulSoup:
         """
         解析HTML内容
@@ -209,6 +373,18 @@ class BaseCollector(ABC):
         Returns:
             是否通过过滤
         """
+        if not self._passes_basic_checks(article):
+            return False
+        
+        # 检查重复内容（简单检查）
+        if self.is_duplicate(article):
+            self.logger.debug(f"检测到重复文章: {article.get('title')}")
+            return False
+        
+        return True
+    
+    def _passes_basic_checks(self, article: Dict[str, Any]) -> bool:
+        """必要字段与内容长度检查（不访问缓存）"""
         # 检查必要字段
         required_fields = ['title', 'content', 'url']
         for field in required_fields:
@@ -222,36 +398,49 @@ class BaseCollector(ABC):
             self.logger.debug(f"文章内容过短: {len(content)} 字符")
             return False
         
-        # 检查重复内容（简单检查）
-        if self.is_duplicate(article):
-            self.logger.debug(f"检测到重复文章: {article.get('title')}")
-            return False
-        
         return True
     
-    def is_duplicate(self, article: Dict[str, Any]) -> bool:
+    async def filter_articles(self, articles: List[Optional[Dict[str, Any]]]) -> List[bool]:
         """
-        检查文章是否重复
+        批量版filter_article：去重标记一次读取、一次写入，磁盘I/O在工作线程执行
+        
+        按列表顺序判定，批内重复的后一篇视为重复，结果与逐篇调用filter_article一致
         
         Args:
-            article: 文章数据
+            articles: 文章列表（None表示采集失败）
             
         Returns:
-            是否重复
+            与articles顺序一致的是否通过过滤
         """
+        passed = [bool(a) and self._passes_basic_checks(a) for a in articles]
+        indices = [i for i, ok in enumerate(passed) if ok]
+        new = await self.async_duplicates.mark_new(self._duplicate_key(articles[i]) for i in indices)
+        for i, is_new in zip(indices, new):
+            if not is_new:
+                self.logger.debug(f"检测到重复文章: {articles[i].get('title')}")
+                passed[i] = False
+        return passed
+    
+    @staticmethod
+    def _duplicate_key(article: Dict[str, Any]) -> str:
         # 使用标题和内容生成唯一标识
         content_hash = hashlib.md5(
             f"{article.get('title', '')}_{article.get('content', '')[:100]}".encode()
         ).hexdigest()
+        return f"duplicate_{content_hash}"
+    
+    def is_duplicate(self, article: Dict[str, Any]) -> bool:
+        """
+        检查文章是否重复
         
-        # 检查缓存中是否存在
-        duplicate_key = f"duplicate_{content_hash}"
-        if self.cache.get(duplicate_key):
-            return True
-        
-        # 标记为已处理
-        self.cache.set(duplicate_key, '1', ttl=86400)  # 24小时
-        return False
+        Args:
+            article: 文章数据
+            
+        Returns:
+            是否重复
+        """
+        # 未标记过则标记为已处理
+        return not self.duplicates.mark_new([self._duplicate_key(article)])[0]
     
     def save_raw_data(self, data: List[Dict[str, Any]], data_type: str = 'raw'):
         """
@@ -306,8 +495,16 @@ class BaseCollector(ABC):
         }
     
     def cleanup(self):
-        """清理资源"""
-        pass
+        """清理资源（保存负缓存，清理长期过期的页面缓存）"""
+        try:
+            self.negative_cache.save()
+        except Exception as e:
+            self.logger.warning(f"保存负缓存失败: {e}")
+        try:
+            retention = self.config.get('storage', {}).get('retention', {})
+            self.http_cache.prune(retention.get('http_cache_days', 14))
+        except Exception as e:
+            self.logger.warning(f"清理页面缓存失败: {e}")
 
 
 class NewsCollector(BaseCollector):
@@ -337,23 +534,25 @@ class NewsCollector(BaseCollector):
             # 限制文章数量
             article_links = article_links[:self.max_articles]
             
-            # 采集每篇文章
-            articles = []
-            for link in article_links:
-                try:
-                    article = await self.collect_article(link)
-                    if article and self.filter_article(article):
-                        articles.append(article)
-                        self.stats['articles_collected'] += 1
-                    else:
-                        self.stats['articles_filtered'] += 1
-                except Exception as e:
-                    self.logger.error(f"采集文章失败 {link}: {str(e)}")
+            # 并发采集文章；过滤和去重在全部返回后按链接顺序批量进行，结果与顺序采集一致且无竞争
+            results = await self.gather_bounded(article_links, self.collect_article)
+            fetched = []
+            for link, article in zip(article_links, results):
+                if isinstance(article, BaseException):
+                    self.logger.error(f"采集文章失败 {link}: {str(article)}")
                     continue
+                fetched.append(article)
+            articles = []
+            for article, ok in zip(fetched, await self.filter_articles(fetched)):
+                if ok:
+                    articles.append(article)
+                    self.stats['articles_collected'] += 1
+                else:
+                    self.stats['articles_filtered'] += 1
             
             # 保存原始数据
             if articles and self.config.get('collectors', {}).get('parameters', {}).get('save_raw_data', True):
-                self.save_raw_data(articles, 'raw')
+                await asyncio.to_thread(self.save_raw_data, articles, 'raw')
             
             # 更新统计
             duration = time.time() - start_time
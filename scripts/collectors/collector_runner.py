@@ -4,33 +4,56 @@
 import os
 import sys
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+import httpx
 
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from scripts.utils.http_replay import install_from_env
 from scripts.utils.logger import setup_logger
+from scripts.collectors.base_collector import create_async_client
 from scripts.collectors.tech_news_collector import Kr36Collector, HuxiuCollector, TMTPostCollector
 from scripts.collectors.finance_collector import WallStreetCNCollector
 
 
 class CollectorRunner:
+    """持有所有采集器共享的httpx.AsyncClient；用完调用cleanup()（或 async with CollectorRunner(cfg) as runner）"""
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.client: Optional[httpx.AsyncClient] = None
+        self.collectors: List[Any] = []
         self.logger = setup_logger("collector_runner", level=config.get("logging", {}).get("level", "INFO"))
+        # NEWS_HTTP_MODE=record/replay时所有采集器的httpx请求走本地cassette
+        mode = install_from_env()
+        if mode:
+            self.logger.info(f"HTTP {mode} 模式，cassette: {os.getenv('NEWS_HTTP_CASSETTE')}")
+
+    async def __aenter__(self) -> "CollectorRunner":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.cleanup()
 
     def _make_collector(self, src: Dict[str, Any]):
         url = src.get("url", "")
         if "36kr.com" in url:
-            return Kr36Collector(self.config, src)
-        if "huxiu.com" in url:
-            return HuxiuCollector(self.config, src)
-        if "tmtpost.com" in url:
-            return TMTPostCollector(self.config, src)
-        if "wallstreetcn.com" in url:
-            return WallStreetCNCollector(self.config, src)
-        # fallback
-        return Kr36Collector(self.config, src)
+            collector = Kr36Collector(self.config, src)
+        elif "huxiu.com" in url:
+            collector = HuxiuCollector(self.config, src)
+        elif "tmtpost.com" in url:
+            collector = TMTPostCollector(self.config, src)
+        elif "wallstreetcn.com" in url:
+            collector = WallStreetCNCollector(self.config, src)
+        else:
+            # fallback
+            collector = Kr36Collector(self.config, src)
+        # 所有采集器复用同一个连接池：列表页和文章页、同站点的不同采集器之间都不再重复握手
+        collector.client = self.client
+        self.collectors.append(collector)
+        return collector
 
     async def collect_all(self) -> Dict[str, List[Dict[str, Any]]]:
         industry_articles: Dict[str, List[Dict[str, Any]]] = {}
@@ -43,8 +66,11 @@ class CollectorRunner:
                     if src.get("enabled", True):
                         all_sources.append(src)
 
+        if self.client is None:
+            self.client = create_async_client(self.config)
         collectors = [self._make_collector(s) for s in all_sources]
         results = await asyncio.gather(*[c.collect() for c in collectors], return_exceptions=True)
+        await asyncio.gather(*[c.wait_revalidations() for c in collectors], return_exceptions=True)
 
         # 归类：简单按source_type映射行业（可扩展为关键词匹配）
         for src, res in zip(all_sources, results):
@@ -64,4 +90,16 @@ class CollectorRunner:
                 assigned = assigned or "科技"
                 industry_articles.setdefault(assigned, []).append(a)
 
-        return industry_articles
\ No newline at end of file
+        return industry_articles
+
+    async def cleanup(self) -> None:
+        """释放采集器资源并关闭共享客户端（连接池）"""
+        for collector in self.collectors:
+            try:
+                collector.cleanup()
+            except Exception as e:
+                self.logger.warning(f"采集器清理失败 {collector.source_name}: {e}")
+        self.collectors = []
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
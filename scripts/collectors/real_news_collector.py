@@ -4,32 +4,52 @@
 从实际网站采集行业新闻和数据
 """
 
-import requests
+import os
+import sys
+import asyncio
 from bs4 import BeautifulSoup
-import logging
 from datetime import datetime
-from typing import List, Dict, Optional
-import time
+from typing import Any, List, Dict, Optional
 import random
 from urllib.parse import urljoin
 import feedparser
 
-class RealNewsCollector:
-    """真实新闻采集器"""
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scripts.collectors.base_collector import BaseCollector, create_async_client
+from scripts.utils.circuit_breaker import CircuitBreaker
+from scripts.utils.http_replay import install_from_env
+from scripts.utils.rate_limiter import HostRateLimiter
+
+class RealNewsCollector(BaseCollector):
+    """真实新闻采集器（多数据源，异步并发；同一主机按令牌桶限速）"""
     
     def __init__(self, config):
-        self.config = config
-        self.logger = logging.getLogger(__name__)
+        super().__init__(config, {'name': 'real_news', 'type': 'mixed', 'update_interval': 0})
+        install_from_env()
         
-        # 用户代理列表，避免被屏蔽
+        # 用户代理列表，避免被屏蔽（每次运行选用一个）
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
         ]
+        self.headers['User-Agent'] = random.choice(self.user_agents)
+        self.timeout = config.get('collectors', {}).get('timeout', 10)
+        
+        # 避免请求过于频繁：同一主机每秒最多host_requests_per_second个请求（可突发host_burst个），不同主机并行
+        params = config.get('collectors', {}).get('parameters', {})
+        self.rate_limiter = HostRateLimiter(params.get('host_requests_per_second', 0.5),
+                                            params.get('host_burst', 1))
         
         # 配置数据源
         self.sources = self.load_sources()
+
+        # 熔断器：连续失败的源直接跳过（空字符串关闭），状态与collect_news.py共用
+        health_file = self.config.get('collectors', {}).get('health_file', 'data/cache/source_health.json')
+        self.breaker = CircuitBreaker(health_file) if health_file else None
         self.logger.info(f"初始化采集器，配置了 {len(self.sources)} 个数据源")
     
     def load_sources(self) -> List[Dict]:
@@ -71,63 +91,90 @@ class RealNewsCollector:
         
         return [source for source in sources_config if source.get('enabled', True)]
     
-    def collect(self) -> List[Dict]:
-        """执行采集任务"""
-        self.logger.info("开始采集新闻数据...")
-        all_articles = []
+    async def collect(self) -> List[Dict]:
+        """
+        执行采集任务
+        
+        各数据源并发采集，结果按配置顺序合并；未注入共享客户端时本次采集自建一个长连接客户端
         
-        for source in self.sources:
+        Returns:
+            采集到的文章列表
+        """
+        self.logger.info("开始采集新闻数据...")
+        own_client = self.client is None
+        if own_client:
+            self.client = create_async_client(self.config)
+        try:
+            results = await asyncio.gather(*[self._collect_source(s) for s in self.sources])
+            await self.wait_revalidations()
+        finally:
+            if own_client:
+                await self.client.aclose()
+                self.client = None
+        all_articles = [a for articles in results for a in articles]
+        
+        if self.breaker:
             try:
-                self.logger.info(f"采集源: {source['name']}")
-                articles = self.collect_from_source(source)
-                
-                if articles:
-                    all_articles.extend(articles)
-                    self.logger.info(f"从 {source['name']} 采集到 {len(articles)} 篇文章")
-                else:
-                    self.logger.warning(f"从 {source['name']} 未采集到文章")
-                
-                # 避免请求过于频繁
-                time.sleep(random.uniform(1, 3))
-                
+                self.breaker.save()
             except Exception as e:
-                self.logger.error(f"采集源 {source.get('name')} 失败: {e}")
-                continue
-        
-        self.logger.info(f"采集完成，总计 {len(all_articles)} 篇文章")
+                self.logger.warning(f"保存源健康状态失败: {e}")
+        try:
+            self.negative_cache.save()
+        except Exception as e:
+            self.logger.warning(f"保存负缓存失败: {e}")
+        self.logger.info(f"采集完成，总计 {len(all_articles)} 篇文章 - 限速等待{self.rate_limiter.stats['waits']}次")
         return all_articles
     
-    def collect_from_source(self, source: Dict) -> List[Dict]:
+    async def _collect_source(self, source: Dict) -> List[Dict]:
+        """采集单个源（熔断检查、日志与异常处理）"""
+        if self.breaker and not self.breaker.allow(source.get('url', '')):
+            self.logger.warning(f"跳过熔断中的源: {source.get('name')}")
+            return []
+        try:
+            self.logger.info(f"采集源: {source['name']}")
+            articles = await self.collect_from_source(source)
+            
+            if articles:
+                self.logger.info(f"从 {source['name']} 采集到 {len(articles)} 篇文章")
+            else:
+                self.logger.warning(f"从 {source['name']} 未采集到文章")
+            return articles
+            
+        except Exception as e:
+            self.logger.error(f"采集源 {source.get('name')} 失败: {e}")
+            return []
+    
+    async def collect_from_source(self, source: Dict) -> List[Dict]:
         """从单个源采集"""
         method = source.get('method', 'web')
         
         if method == 'rss':
-            return self.collect_from_rss(source)
+            return await self.collect_from_rss(source)
         elif method == 'api':
-            return self.collect_from_api(source)
+            return await self.collect_from_api(source)
         else:  # web scraping
-            return self.collect_from_web(source)
+            return await self.collect_from_web(source)
+    
+    async def _fetch_source(self, url: str) -> Optional[str]:
+        """经fetch_url获取并记录熔断器结果；负缓存屏蔽中的URL没有发出请求，不计入熔断"""
+        blocked = self.negative_cache.blocked(url)
+        text = await self.fetch_url(url)
+        if not blocked:
+            self._record_health(url, None if text else f"请求失败: {url}")
+        return text
     
-    def collect_from_web(self, source: Dict) -> List[Dict]:
+    async def collect_from_web(self, source: Dict) -> List[Dict]:
         """通过网页爬虫采集"""
         url = source.get('url', '')
         if not url:
             return []
         
         try:
-            headers = {
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-            }
+            html = await self._fetch_source(url)
+            if not html:
+                raise RuntimeError(f"无法获取页面: {url}")
             
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 根据网站类型使用不同的解析方法
             source_name = source.get('name', '')
@@ -146,14 +193,17 @@ class RealNewsCollector:
             self.logger.error(f"网页采集失败 {source.get('name')}: {e}")
             return []
     
-    def collect_from_rss(self, source: Dict) -> List[Dict]:
+    async def collect_from_rss(self, source: Dict) -> List[Dict]:
         """通过RSS采集"""
         url = source.get('url', '')
         if not url:
             return []
         
         try:
-            feed = feedparser.parse(url)
+            text = await self._fetch_source(url)
+            if not text:
+                return []
+            feed = feedparser.parse(text)
             articles = []
             
             for entry in feed.entries[:10]:  # 最多10条
@@ -179,7 +229,16 @@ class RealNewsCollector:
             self.logger.error(f"RSS采集失败 {source.get('name')}: {e}")
             return []
     
-    def collect_from_api(self, source: Dict) -> List[Dict]:
+    def _record_health(self, url: str, error: Any = None):
+        """记录请求结果到熔断器"""
+        if not self.breaker:
+            return
+        if error is None:
+            self.breaker.record_success(url)
+        else:
+            self.breaker.record_failure(url, error)
+    
+    async def collect_from_api(self, source: Dict) -> List[Dict]:
         """通过API采集"""
         # 这里可以集成NewsAPI等第三方服务
         # 暂时返回空，需要配置API密钥
@@ -463,10 +522,6 @@ class RealNewsCollector:
 
 if __name__ == "__main__":
     # 测试代码
-    import logging
-    
-    logging.basicConfig(level=logging.INFO)
-    
     test_config = {
         "collectors": {
             "sources": [
@@ -482,7 +537,7 @@ if __name__ == "__main__":
     }
     
     collector = RealNewsCollector(test_config)
-    articles = collector.collect()
+    articles = asyncio.run(collector.collect())
     
     print(f"采集到 {len(articles)} 篇文章")
     for article in articles[:3]:
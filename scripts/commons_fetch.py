@@ -13,11 +13,18 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 import time
+from pathlib import Path
 from typing import Any
 
 import requests
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.http_replay import install_from_env
+
 
 COMMONS_API = "https://commons.wikimedia.org/w/api.php"
 
@@ -87,6 +94,7 @@ def main() -> None:
     ap.add_argument("--query", required=True)
     ap.add_argument("--limit", type=int, default=5)
     args = ap.parse_args()
+    install_from_env()
 
     t0 = time.time()
     items = search_images(args.query, args.limit)
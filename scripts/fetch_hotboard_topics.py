@@ -6,10 +6,12 @@ This is used as a *real-time* fallback when RSS collection returns 0 items.
 It:
 - pulls hotboard lists from an allowlist of platforms
 - filters risky/sensitive titles (very conservative)
+- skips platforms whose circuit breaker is open (repeated failures in earlier runs,
+  state in data/cache/source_health.json) instead of waiting out their timeout
 - avoids repeating recent topics (by scanning recent post titles)
 - scores candidates using platform weights + parsed hot_value
 - outputs:
-  - JSON payload (same shape as collect_news.py output)
+  - JSON payload (same shape as collect_news.py output; JSONL when --out ends in .jsonl)
   - optionally prints chosen INDUSTRY/TOPIC for shell consumption
 
 Example:
@@ -30,6 +32,7 @@ import json
 import os
 import random
 import re
+import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -37,6 +40,13 @@ from typing import Any
 
 import requests
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.circuit_breaker import CircuitBreaker
+from scripts.utils.http_replay import install_from_env, state_path
+from scripts.utils.news_payload import write_payload
+
 
 DEFAULT_TYPES = ["zhihu", "36kr", "ithome", "huxiu", "sspai", "juejin"]
 
@@ -220,7 +230,14 @@ def main() -> None:
     ap.add_argument("--shell", action="store_true", help="Print INDUSTRY/TOPIC for shell")
     ap.add_argument("--seed", default=os.getenv("SEED", ""))
     ap.add_argument("--cache", default="data/cache/hotboard_cache.json")
+    ap.add_argument(
+        "--health",
+        default="data/cache/source_health.json",
+        help="Circuit breaker state shared with collect_news.py (empty to disable)",
+    )
     args = ap.parse_args()
+    if install_from_env() == "replay":
+        args.cache, args.health = state_path(args.cache), state_path(args.health)
 
     if args.seed:
         random.seed(args.seed)
@@ -266,23 +283,43 @@ def main() -> None:
                 }
             )
 
-    # Try live fetch first
-    live_ok = False
-    try:
-        for tp in types:
+    # Try live fetch first; one failing platform no longer aborts the others
+    breaker = CircuitBreaker(args.health) if args.health else None
+    keys = {tp: f"hotboard:{tp}" for tp in types}
+    for tp in types:
+        if breaker and not breaker.allow(keys[tp]):
+            print(f"⏭️ hotboard {tp}: circuit open, skipped", file=sys.stderr)
+            continue
+        try:
             doc = fetch_type(tp)
-            fetched_types.append(tp)
-            add_from_doc(doc, tp)
-        live_ok = True
-        # cache raw response (best-effort)
-        cache_path = Path(args.cache)
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.write_text(
-            json.dumps({"fetched_at": time.time(), "types": fetched_types, "candidates": candidates}, ensure_ascii=False),
-            encoding="utf-8",
-        )
-    except Exception as e:
-        print(f"⚠️ hotboard live fetch failed: {e}")
+        except Exception as e:
+            if breaker:
+                breaker.record_failure(keys[tp], e)
+            print(f"⚠️ hotboard live fetch failed ({tp}): {e}", file=sys.stderr)
+            continue
+        if breaker:
+            breaker.record_success(keys[tp])
+        fetched_types.append(tp)
+        add_from_doc(doc, tp)
+    live_ok = bool(fetched_types)
+    if breaker:
+        try:
+            breaker.save()
+        except Exception:
+            pass
+    if live_ok:
+        try:
+            # cache raw response (best-effort)
+            cache_path = Path(args.cache)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(
+                json.dumps(
+                    {"fetched_at": time.time(), "types": fetched_types, "candidates": candidates}, ensure_ascii=False
+                ),
+                encoding="utf-8",
+            )
+        except Exception as e:
+            print(f"⚠️ hotboard cache write failed: {e}", file=sys.stderr)
 
     # If live failed or empty, try cache (within 6h)
     if (not candidates) and Path(args.cache).exists():
@@ -329,13 +366,12 @@ def main() -> None:
             "mode": "hotboard",
             "types_fetched": fetched_types,
             "live_ok": live_ok,
+            "health": breaker.snapshot(keys.values()) if breaker else None,
             "picked": {k: pick.get(k) for k in ["platform", "title", "url", "hot_value", "score"]},
         },
     )
 
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_payload(payload, Path(args.out))
 
     if args.shell:
         print(f"{industry}\t{topic}")
@@ -21,11 +21,18 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import requests
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.capped_download import download_to
+from scripts.utils.http_replay import install_from_env
+
 API = "https://commons.wikimedia.org/w/api.php"
 
 # Wikimedia APIs may return 403 without a proper User-Agent.
@@ -93,10 +100,7 @@ def commons_imageinfo(titles: List[str]) -> List[Dict]:
 
 
 def download(url: str, out_path: Path) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    r = requests.get(url, timeout=60, headers={"User-Agent": UA})
-    r.raise_for_status()
-    out_path.write_bytes(r.content)
+    download_to(url, out_path, timeout=60, headers={"User-Agent": UA})
 
 
 def main() -> None:
@@ -106,6 +110,7 @@ def main() -> None:
     ap.add_argument("--limit", type=int, default=2)
     ap.add_argument("--outfile", default="")
     args = ap.parse_args()
+    install_from_env()
 
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Generate a Hugo post from collected news payload.
 
-Input: JSON from scripts/collect_news.py
+Input: JSON or JSONL payload from scripts/collect_news.py (only the items used are read)
 Output:
 - content/posts/<slug>.md
 - downloads cover image into static/images/posts/<slug>/cover.(jpg|png|webp) when possible
@@ -21,13 +21,24 @@ import argparse
 import json
 import os
 import re
+import sys
 import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.capped_download import download_to
+from scripts.utils.http_replay import install_from_env
+from scripts.utils.image_probe import rank_candidates
+from scripts.utils.news_payload import load_payload
+from scripts.utils.seen_ledger import SeenLedger
+from scripts.utils.source_scores import SourceScorecard
+
 
 def slugify(s: str) -> str:
     s = s.lower().strip()
@@ -37,28 +48,50 @@ def slugify(s: str) -> str:
     return s[:80].strip("-")
 
 
-def download_cover(url: str, out_dir: Path) -> Optional[str]:
+def download_cover(
+    url: str, out_dir: Path, max_bytes: Optional[int] = None, ext: Optional[str] = None
+) -> Optional[str]:
     if not url:
         return None
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # guess extension
-    ext = "jpg"
-    m = re.search(r"\.(jpg|jpeg|png|webp)(\?|$)", url.lower())
-    if m:
-        ext = "jpg" if m.group(1) == "jpeg" else m.group(1)
+    # guess extension (unless the probe already sniffed the format)
+    if not ext:
+        ext = "jpg"
+        m = re.search(r"\.(jpg|jpeg|png|webp)(\?|$)", url.lower())
+        if m:
+            ext = "jpg" if m.group(1) == "jpeg" else m.group(1)
 
     out_path = out_dir / f"cover.{ext}"
 
     try:
-        r = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=25)
-        r.raise_for_status()
-        out_path.write_bytes(r.content)
+        # Streamed with a size cap: oversized "covers" are abandoned instead of buffered
+        download_to(url, out_path, timeout=25, max_bytes=max_bytes, headers={"User-Agent": "Mozilla/5.0"})
         return f"/images/posts/{out_dir.name}/{out_path.name}"
     except Exception:
         return None
 
 
+def choose_cover(items: List[Dict[str, Any]], out_dir: Path, max_bytes: Optional[int] = None) -> Optional[str]:
+    """Probe the items' cover candidates (first few KB each) and download only the best-ranked one."""
+    urls: List[str] = []
+    for it in items:
+        urls += [it.get("cover_image_url")] + list(it.get("cover_candidates") or [])
+    urls = list(dict.fromkeys(u for u in urls if u))[:16]
+    probed: List[Dict[str, Any]] = []
+    ranked = rank_candidates(urls, headers={"User-Agent": "Mozilla/5.0"}, probed=probed)
+    for cand in ranked[:3]:
+        rel = download_cover(cand["url"], out_dir, max_bytes, ext=cand["format"])
+        if rel:
+            return rel
+    # Probed but all too small / banner-shaped: no cover beats a logo
+    if probed:
+        return None
+    # Nothing could be probed (e.g. hosts rejecting partial reads): previous first-cover behaviour
+    first = next((it["cover_image_url"] for it in items if it.get("cover_image_url")), None)
+    return download_cover(first, out_dir, max_bytes) if first else None
+
+
 def build_prompt(payload: Dict[str, Any], title: str, industry: str) -> str:
     items = payload.get("items", [])[:10]
     # Keep context small but rich: title, source, url, published, key excerpts
@@ -68,11 +101,17 @@ def build_prompt(payload: Dict[str, Any], title: str, industry: str) -> str:
 
     source_blocks = []
     for i, it in enumerate(items, 1):
+        # Same story reported elsewhere (clustered by collect_news); listed as extra URLs, no excerpt
+        also = "".join(
+            f"also reported: {r.get('source','')} | {r.get('title','').strip()} | {r.get('url','')}\n"
+            for r in (it.get("related") or [])[:3]
+        )
         source_blocks.append(
             f"[{i}] {it.get('title','').strip()}\n"
             f"source: {it.get('source','')}\n"
             f"published: {it.get('published','')}\n"
             f"url: {it.get('url','')}\n"
+            f"{also}"
             f"excerpt: {clip(it.get('content_text','') or it.get('summary',''), 1200)}\n"
         )
 
@@ -83,7 +122,7 @@ def build_prompt(payload: Dict[str, Any], title: str, industry: str) -> str:
         "硬性规则（非常重要）：\n"
         "1) 只允许使用素材里出现的事实/数字/结论；不要编造任何数据、公司动作、政策细节。\n"
         "2) 文中出现的数据/结论必须在段尾用[编号]标注引用来源（例如：[1][3]）。\n"
-        "3) 文末给出“来源列表”，按[编号]列出标题+URL。\n"
+        "3) 文末给出“来源列表”，按[编号]列出标题+URL；素材中的 also reported 是同一事件的其他报道，可在同一编号下一并列出。\n"
         "4) 文章不少于 1800 字，结构清晰：\n"
         "   - 核心摘要（3-5条）\n"
         "   - 今日要点（按主题分3-5节）\n"
@@ -97,6 +136,19 @@ def build_prompt(payload: Dict[str, Any], title: str, industry: str) -> str:
     )
 
 
+# [1] / [1][3] / [1, 3] / [1、3]; not markdown links like [1](url)
+CITATION_RE = re.compile(r"\[(\d+(?:\s*[,，、]\s*\d+)*)\](?!\()")
+# Heading line of the closing source list, which may enumerate every item whether cited or not
+SOURCE_LIST_RE = re.compile(r"(?m)^[#*\s]*(?:来源列表|参考来源|参考资料|来源|Sources|References)\b.{0,20}$")
+
+
+def cited_items(article_md: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Prompt items (numbered from 1, as in build_prompt) that the article actually references."""
+    text = SOURCE_LIST_RE.split(article_md, maxsplit=1)[0]
+    refs = {int(n) for group in CITATION_RE.findall(text) for n in re.findall(r"\d+", group)}
+    return [it for i, it in enumerate(items, 1) if i in refs]
+
+
 def call_deepseek(prompt: str) -> str:
     api_key = os.getenv("DEEPSEEK_API_KEY")
     if not api_key:
@@ -145,9 +197,27 @@ def main() -> None:
         default="",
         help="Optional cover image URL path (e.g. /images/posts/<slug>/cover.jpg). Overrides downloaded cover.",
     )
+    ap.add_argument(
+        "--max-cover-bytes",
+        type=int,
+        default=0,
+        help="Give up on source cover images larger than this (default: image cap in scripts/utils/capped_download.py)",
+    )
+    ap.add_argument(
+        "--ledger",
+        default="data/cache/seen_urls.sqlite",
+        help="Seen-URL ledger shared with collect_news.py; cited URLs are marked as used (empty to disable)",
+    )
+    ap.add_argument(
+        "--scores",
+        default="data/cache/source_scores.json",
+        help="Source scorecard shared with collect_news.py; cited sources are credited (empty to disable)",
+    )
     args = ap.parse_args()
+    install_from_env()
 
-    payload = json.loads(Path(args.inp).read_text(encoding="utf-8"))
+    # Prompt, cover and ledger only look at the first 10 sources
+    payload = load_payload(args.inp, limit=10)
 
     if not payload.get("items"):
         # Soft-fallback: still generate an evergreen/analysis-style post driven by the topic/title.
@@ -157,15 +227,11 @@ def main() -> None:
     # cover
     cover_rel = (args.cover or "").strip() or None
 
-    # If not provided, pick first available from sources and download.
+    # If not provided, pick the best-sized image among the sources' candidates and download it.
     if not cover_rel:
-        cover_url = None
-        for it in payload.get("items", [])[:10]:
-            if it.get("cover_image_url"):
-                cover_url = it["cover_image_url"]
-                break
-        if cover_url:
-            cover_rel = download_cover(cover_url, Path("static/images/posts") / args.slug)
+        cover_rel = choose_cover(
+            payload.get("items", [])[:10], Path("static/images/posts") / args.slug, args.max_cover_bytes or None
+        )
 
     prompt = build_prompt(payload, args.title, args.industry)
     article_md = call_deepseek(prompt)
@@ -215,6 +281,24 @@ def main() -> None:
     out_path.write_text("\n".join(fm_lines) + body + "\n", encoding="utf-8")
     print(f"✅ wrote post -> {out_path}")
 
+    # Record which source URLs this post cites (best-effort); uncited items stay available to later runs
+    if args.ledger and payload.get("items"):
+        try:
+            ledger = SeenLedger(args.ledger)
+            cited = cited_items(article_md, payload["items"][:10])
+            urls = [it.get("url", "") for it in cited] + [r.get("url", "") for it in cited for r in it.get("related") or []]
+            ledger.mark_used(urls, args.slug)
+            ledger.close()
+        except Exception as e:
+            print(f"⚠️ ledger update failed: {e}")
+    if args.scores and payload.get("items"):
+        try:
+            scores = SourceScorecard(args.scores)
+            scores.mark_cited([it.get("source", "") for it in cited_items(article_md, payload["items"][:10])])
+            scores.save()
+        except Exception as e:
+            print(f"⚠️ source scorecard update failed: {e}")
+
 
 if __name__ == "__main__":
     main()
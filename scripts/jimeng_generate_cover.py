@@ -22,12 +22,19 @@ import hashlib
 import hmac
 import json
 import os
+import sys
 import time
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
 import requests
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.capped_download import download_to
+from scripts.utils.http_replay import install_from_env
+
 HOST = "visual.volcengineapi.com"
 ENDPOINT = f"https://{HOST}"
 REGION = "cn-north-1"
@@ -169,10 +176,7 @@ def build_prompt(title: str, industry: str) -> str:
 
 
 def download_image(url: str, out_path: Path) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    r = requests.get(url, timeout=60)
-    r.raise_for_status()
-    out_path.write_bytes(r.content)
+    download_to(url, out_path, timeout=60)
 
 
 def main() -> None:
@@ -185,6 +189,7 @@ def main() -> None:
     ap.add_argument("--height", type=int, default=936)
     ap.add_argument("--poll-seconds", type=int, default=120)
     args = ap.parse_args()
+    install_from_env()
 
     prompt = build_prompt(args.title, args.industry)
     task_id = submit_task(prompt, args.width, args.height)
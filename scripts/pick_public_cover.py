@@ -20,11 +20,18 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
-import requests
 import yaml
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.utils.capped_download import download_to
+from scripts.utils.http_replay import install_from_env
+from scripts.utils.news_payload import iter_items
+
 
 def norm(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip())
@@ -46,8 +53,7 @@ def build_context_text(title: str, md_path: str | None, news_json: str | None) -
     # news sources titles
     if news_json:
         try:
-            data = json.loads(Path(news_json).read_text(encoding="utf-8"))
-            for it in (data.get("items") or [])[:25]:
+            for it in iter_items(news_json, limit=25):
                 t = it.get("title") or ""
                 if t:
                     parts.append(t)
@@ -86,9 +92,7 @@ def score_item(item: dict, ctx: str) -> float:
 def download(url: str, out_path: Path) -> bool:
     out_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        r = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
-        r.raise_for_status()
-        out_path.write_bytes(r.content)
+        download_to(url, out_path, timeout=30, headers={"User-Agent": "Mozilla/5.0"})
         return True
     except Exception:
         return False
@@ -104,6 +108,7 @@ def main() -> None:
     ap.add_argument("--md", default="")
     ap.add_argument("--news-json", default="")
     args = ap.parse_args()
+    install_from_env()
 
     doc = yaml.safe_load(Path(args.pool).read_text(encoding="utf-8")) or {}
     pool = list(doc.get("pool") or [])
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""缓存的异步门面：磁盘读写与(反)序列化放到工作线程执行，不阻塞事件循环；语义与同步版本相同"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from scripts.utils.cache import MarkerSet
+from scripts.utils.http_cache import HttpCache
+
+
+class AsyncMarkerSet:
+    def __init__(self, markers: MarkerSet):
+        self.markers = markers
+
+    async def mark_new(self, keys: Iterable[str]) -> List[bool]:
+        """一次线程切换判定并标记一批键"""
+        return await asyncio.to_thread(self.markers.mark_new, list(keys))
+
+
+class AsyncHttpCache:
+    def __init__(self, cache: HttpCache):
+        self.cache = cache
+
+    async def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.cache.lookup, url)
+
+    async def store(self, url: str, status: int, headers: Iterable[Tuple[str, str]], body: bytes) -> bool:
+        return await asyncio.to_thread(self.cache.store, url, status, list(headers), body)
+
+    async def refresh(self, url: str, entry: Dict[str, Any], headers: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.cache.refresh, url, entry, list(headers))
+
+    # 以下只操作内存，直接转发
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        return self.cache.conditional_headers(entry)
+
+    def begin_revalidation(self, url: str) -> bool:
+        return self.cache.begin_revalidation(url)
+
+    def end_revalidation(self, url: str) -> None:
+        self.cache.end_revalidation(url)
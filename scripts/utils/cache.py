@@ -3,9 +3,10 @@
 
 import os
 import json
+import threading
 import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
 class CacheManager:
@@ -34,4 +35,49 @@ class CacheManager:
     def set(self, key: str, value: Any, ttl: int = 3600) -> None:
         p = self._path(key)
         payload = {"value": value, "expires_at": time.time() + ttl if ttl else None}
-        p.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
\ No newline at end of file
+        # 先写临时文件再替换：可能在多个工作线程中并发写入
+        tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(p)
+
+
+class MarkerSet:
+    """单文件的带过期时间的键集合（如去重标记）：启动时读入一次，每批标记写回一次"""
+
+    def __init__(self, path: str, ttl: int = 86400):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> 过期时间戳
+        self.entries: Dict[str, float] = self._load()
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def mark_new(self, keys: Iterable[str]) -> List[bool]:
+        """按顺序判定并标记：未标记过（含已过期）的键返回True；同一批内重复出现的键只有第一次为True"""
+        with self._lock:
+            now = time.time()
+            out = []
+            added = {}
+            for key in keys:
+                new = self.entries.get(key, 0) <= now and key not in added
+                if new:
+                    added[key] = now + self.ttl
+                out.append(new)
+            if added:
+                self.entries.update(added)
+                self._save(now)
+            return out
+
+    def _save(self, now: float) -> None:
+        # 与文件合并，保留同一文件其他写入者的标记，并丢弃过期项
+        merged = {k: exp for k, exp in {**self._load(), **self.entries}.items() if exp > now}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(merged), encoding="utf-8")
+        tmp.replace(self.path)
+        self.entries = merged
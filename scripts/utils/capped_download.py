@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""限量流式下载：按内容类型设定最大字节数，先查Content-Length，超限提前中断（HTML截断保留前缀，图片放弃），统计省下的字节数"""
+
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import requests
+
+MB = 1024 * 1024
+
+# 按Content-Type前缀匹配，最长前缀优先
+DEFAULT_CAPS: Dict[str, int] = {
+    "text/html": int(1.5 * MB),
+    "application/xhtml": int(1.5 * MB),
+    "image/": 10 * MB,
+    "": 5 * MB,
+}
+
+# bytes: 实际读取; avoided: 因上限未下载的字节（仅在Content-Length已知时可计）;
+# rejected: 因超限放弃的响应数; truncated: 截断保留前缀的响应数
+DOWNLOAD_STATS: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class DeadlinePassed(Exception):
+    """读取响应体时到达截止时间"""
+
+
+@contextmanager
+def abort_at(r: requests.Response, deadline: Optional[float]) -> Iterator[None]:
+    """到截止时间（time.monotonic()）时关闭底层socket并抛出DeadlinePassed
+
+    读超时只约束单次recv，持续滴流少量字节的服务器能让读取无限期进行下去；
+    r.close()唤醒不了阻塞中的读取，只有shutdown可以
+    """
+    if deadline is None:
+        yield
+        return
+
+    def kill() -> None:
+        sock = getattr(getattr(r.raw, "_connection", None), "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    timer = threading.Timer(max(0.0, deadline - time.monotonic()), kill)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    except Exception as e:
+        if time.monotonic() >= deadline:
+            raise DeadlinePassed(f"{r.url}: deadline passed while reading the body") from e
+        raise
+    finally:
+        timer.cancel()
+
+
+def _bump(**kw: int) -> None:
+    with _stats_lock:
+        DOWNLOAD_STATS.update(kw)
+
+
+def cap_for(content_type: str, caps: Optional[Dict[str, int]] = None) -> int:
+    caps = caps or DEFAULT_CAPS
+    ctype = (content_type or "").split(";")[0].strip().lower()
+    best = max((p for p in caps if ctype.startswith(p)), key=len, default="")
+    return caps.get(best, DEFAULT_CAPS[""])
+
+
+def _wire_bytes(r: requests.Response, fallback: int) -> int:
+    # Content-Length是压缩后的长度，用已从连接读取的字节数对比
+    tell = getattr(r.raw, "tell", None)
+    try:
+        return int(tell()) if tell else fallback
+    except Exception:
+        return fallback
+
+
+def _declared_length(r: requests.Response) -> Optional[int]:
+    try:
+        return int(r.headers.get("Content-Length", ""))
+    except ValueError:
+        return None
+
+
+def _iter_capped(r: requests.Response, cap: int, truncate: bool, chunk_size: int):
+    """逐块产出响应体；超过cap时截断（truncate）或抛出BodyTooLarge"""
+    declared = _declared_length(r)
+    encoded = bool(r.headers.get("Content-Encoding"))
+    # 未压缩且声明长度已超限：图片直接放弃，HTML只读前cap字节
+    if declared is not None and not encoded and declared > cap and not truncate:
+        _bump(avoided=declared, rejected=1)
+        raise BodyTooLarge(f"{r.url}: Content-Length {declared} > {cap}")
+    got = 0
+    for chunk in r.iter_content(chunk_size=chunk_size):
+        if not chunk:
+            continue
+        if got + len(chunk) > cap:
+            if not truncate:
+                _bump(bytes=got, avoided=max(0, (declared or 0) - _wire_bytes(r, got)), rejected=1)
+                raise BodyTooLarge(f"{r.url}: body exceeds {cap} bytes")
+            yield chunk[: cap - got]
+            got = cap
+            _bump(bytes=got, avoided=max(0, (declared or 0) - _wire_bytes(r, got)), truncated=1)
+            return
+        got += len(chunk)
+        yield chunk
+    _bump(bytes=got)
+
+
+def fetch_capped(
+    url: str,
+    session: Optional[requests.Session] = None,
+    timeout: float = 20,
+    max_bytes: Optional[int] = None,
+    truncate: bool = False,
+    caps: Optional[Dict[str, int]] = None,
+    chunk_size: int = 64 * 1024,
+    info: Optional[Dict[str, Any]] = None,
+    deadline: Optional[float] = None,
+    **kwargs: Any,
+) -> Tuple[bytes, str, bool]:
+    """GET并读入内存，返回 (body, content_type, truncated)；max_bytes为空时按内容类型取上限
+
+    info给出时填入status与响应头（供HTTP缓存使用；304时body为空）；
+    deadline（time.monotonic()）给出时读取到期即中断并抛出DeadlinePassed
+    """
+    with (session or requests).get(url, timeout=timeout, stream=True, **kwargs) as r, abort_at(r, deadline):
+        r.raise_for_status()
+        if info is not None:
+            info.update(status=r.status_code, headers=list(r.headers.items()))
+        content_type = r.headers.get("Content-Type", "")
+        cap = max_bytes or cap_for(content_type, caps)
+        body = b"".join(_iter_capped(r, cap, truncate, chunk_size))
+    return body, content_type, len(body) >= cap
+
+
+def download_to(
+    url: str,
+    out_path: Path,
+    session: Optional[requests.Session] = None,
+    timeout: float = 60,
+    max_bytes: Optional[int] = None,
+    caps: Optional[Dict[str, int]] = None,
+    chunk_size: int = 64 * 1024,
+    **kwargs: Any,
+) -> int:
+    """流式写入文件（先写临时文件，超限则删除并抛出BodyTooLarge），返回写入字节数"""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(out_path.suffix + ".part")
+    written = 0
+    try:
+        with (session or requests).get(url, timeout=timeout, stream=True, **kwargs) as r:
+            r.raise_for_status()
+            cap = max_bytes or cap_for(r.headers.get("Content-Type", ""), caps)
+            with open(tmp, "wb") as f:
+                for chunk in _iter_capped(r, cap, False, chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+        tmp.replace(out_path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return written
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""按来源的熔断器：连续失败后打开（直接跳过，不再等超时），到期后放行一次半开探测；状态跨运行持久化"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 连续失败次数达到阈值即打开；每次探测失败打开时长翻倍，封顶MAX_OPEN_SECONDS
+FAILURE_THRESHOLD = 3
+OPEN_SECONDS = 3600
+MAX_OPEN_SECONDS = 24 * 3600
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        open_seconds: float = OPEN_SECONDS,
+        max_open_seconds: float = MAX_OPEN_SECONDS,
+    ):
+        self.path = Path(path) if path else None
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self._lock = threading.Lock()
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        # 本进程内已放行的半开探测（每个来源只放行一次）与被跳过的次数
+        self._probing: set = set()
+        self.skipped: Dict[str, int] = {}
+        if self.path and self.path.exists():
+            try:
+                self.sources = json.loads(self.path.read_text(encoding="utf-8")).get("sources", {})
+            except Exception:
+                self.sources = {}
+
+    def _source(self, key: str) -> Dict[str, Any]:
+        return self.sources.setdefault(
+            key, {"state": CLOSED, "failures": 0, "trips": 0, "open_until": 0, "last_error": None, "updated_at": 0}
+        )
+
+    def state(self, key: str) -> str:
+        st = self.sources.get(key)
+        return st["state"] if st else CLOSED
+
+    def allow(self, key: str) -> bool:
+        """是否发起请求；打开且未到期时返回False（计入skipped），到期后只放行一次探测"""
+        with self._lock:
+            st = self.sources.get(key)
+            if not st or st["state"] == CLOSED:
+                return True
+            if key not in self._probing and time.time() >= st["open_until"]:
+                # 上次运行中断留下的half_open同样重新探测
+                st["state"] = HALF_OPEN
+                self._probing.add(key)
+                return True
+            self.skipped[key] = self.skipped.get(key, 0) + 1
+            return False
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            st = self.sources.get(key)
+            if not st:
+                return
+            st.update(state=CLOSED, failures=0, trips=0, open_until=0, updated_at=time.time())
+            self._probing.discard(key)
+
+    def record_failure(self, key: str, error: Any = None) -> None:
+        with self._lock:
+            st = self._source(key)
+            st["failures"] += 1
+            st["last_error"] = str(error)[:200] if error is not None else None
+            st["updated_at"] = now = time.time()
+            if st["state"] == HALF_OPEN or st["failures"] >= self.failure_threshold:
+                # 探测失败或刚达阈值：重新打开，时长随连续打开次数指数增长
+                seconds = min(self.open_seconds * (2 ** st["trips"]), self.max_open_seconds)
+                st.update(state=OPEN, trips=st["trips"] + 1, open_until=now + seconds)
+            self._probing.discard(key)
+
+    def snapshot(self, keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """运行状态摘要：非closed来源的状态/下次探测时间，以及本次被跳过的次数"""
+        with self._lock:
+            wanted = set(keys) if keys is not None else None
+            unhealthy = {}
+            for key, st in self.sources.items():
+                if (wanted is not None and key not in wanted) or st["state"] == CLOSED:
+                    continue
+                unhealthy[key] = {
+                    "state": st["state"],
+                    "failures": st["failures"],
+                    "retry_in_s": max(0, round(st["open_until"] - time.time())),
+                    "last_error": st["last_error"],
+                }
+            skipped = {k: n for k, n in self.skipped.items() if wanted is None or k in wanted}
+            return {"unhealthy": unhealthy, "skipped": sum(skipped.values())}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            # 健康（closed且无失败记录）的来源不必保存
+            data = {k: st for k, st in self.sources.items() if st["state"] != CLOSED or st["failures"]}
+            tmp.write_text(json.dumps({"sources": data}, ensure_ascii=False, indent=1), encoding="utf-8")
+        tmp.replace(self.path)
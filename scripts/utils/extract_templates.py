@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""按域名学习的正文提取模板：记录readability选中的正文节点，同站后续页面直接用选择器取正文"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class TemplateStore:
+    def __init__(self, path: str, min_votes: int = 2):
+        self.path = Path(path)
+        self.min_votes = min_votes
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self.hosts = json.loads(self.path.read_text(encoding="utf-8")).get("hosts", {})
+            except Exception:
+                self.hosts = {}
+
+    def _host(self, host: str) -> Dict[str, Any]:
+        return self.hosts.setdefault(
+            host,
+            {
+                "votes": {},
+                "avg_len": 0.0,
+                "hits": 0,
+                "misses": 0,
+                "learned": 0,
+                "readability_ms": 0.0,
+                "template_ms": 0.0,
+                "updated_at": 0,
+            },
+        )
+
+    def get(self, host: str) -> Optional[Dict[str, Any]]:
+        """返回可用模板 {"selector", "min_len"}；票数不足时返回None（继续走readability学习）"""
+        with self._lock:
+            st = self.hosts.get(host)
+            if not st or not st["votes"]:
+                return None
+            selector, votes = max(st["votes"].items(), key=lambda kv: kv[1])
+            if votes < self.min_votes:
+                return None
+            # 模板结果明显短于该站readability平均正文长度时视为失败
+            return {"selector": selector, "min_len": max(200, int(st["avg_len"] * 0.5))}
+
+    def observe(self, host: str, info: Dict[str, Any]) -> None:
+        """记录一次提取结果（info来自collect_news.extract_page）"""
+        with self._lock:
+            st = self._host(host)
+            st["updated_at"] = time.time()
+            if info.get("method") == "template":
+                st["hits"] += 1
+                st["template_ms"] += info.get("cpu_ms", 0.0)
+                return
+            if info.get("template_miss"):
+                st["misses"] += 1
+            selector = info.get("selector")
+            if not selector:
+                return
+            st["learned"] += 1
+            st["readability_ms"] += info.get("cpu_ms", 0.0)
+            st["votes"][selector] = st["votes"].get(selector, 0) + 1
+            n = st["learned"]
+            st["avg_len"] += (info.get("text_len", 0) - st["avg_len"]) / n
+
+    def summary(self) -> Dict[str, Any]:
+        hits = misses = 0
+        saved_ms = 0.0
+        with self._lock:
+            for st in self.hosts.values():
+                hits += st["hits"]
+                misses += st["misses"]
+                if st["learned"] and st["hits"]:
+                    per_readability = st["readability_ms"] / st["learned"]
+                    per_template = st["template_ms"] / st["hits"]
+                    saved_ms += st["hits"] * max(0.0, per_readability - per_template)
+        return {"hosts": len(self.hosts), "hits": hits, "misses": misses, "cpu_ms_saved": round(saved_ms, 1)}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            tmp.write_text(json.dumps({"hosts": self.hosts}, ensure_ascii=False, indent=1), encoding="utf-8")
+        tmp.replace(self.path)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""RSS条件请求状态：保存每个feed的ETag/Last-Modified及上次解析出的条目"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class FeedStateStore:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.feeds: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self.feeds = json.loads(self.path.read_text(encoding="utf-8")).get("feeds", {})
+            except Exception:
+                self.feeds = {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        st = self.feeds.get(url) or {}
+        headers = {}
+        if st.get("etag"):
+            headers["If-None-Match"] = st["etag"]
+        if st.get("last_modified"):
+            headers["If-Modified-Since"] = st["last_modified"]
+        return headers
+
+    def cached_entries(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        st = self.feeds.get(url)
+        if not st:
+            return None
+        st["checked_at"] = time.time()
+        return st.get("entries") or []
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str], entries: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        self.feeds[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "entries": entries,
+            "fetched_at": now,
+            "checked_at": now,
+        }
+
+    def save(self, max_age: int = 14 * 86400) -> None:
+        # 长期未访问的feed（已从配置移除）不再保留
+        cutoff = time.time() - max_age
+        self.feeds = {k: v for k, v in self.feeds.items() if v.get("checked_at", 0) >= cutoff}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"feeds": self.feeds}, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
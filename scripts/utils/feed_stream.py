@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""RSS/Atom增量解析：按文档顺序逐条产出条目，条目处理完即释放，调用方可随时停止读取剩余内容"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from feedparser.datetimes import _parse_date
+from lxml import etree
+
+ENTRY_TAGS = ("item", "entry")
+
+
+def _local(tag: Any) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+def _text(el: Optional[etree._Element]) -> str:
+    if el is None:
+        return ""
+    if el.get("type") == "xhtml" or len(el):
+        return " ".join(el.itertext())
+    return el.text or ""
+
+
+def _published(children: Dict[str, etree._Element]) -> Optional[datetime]:
+    for key in ("pubDate", "published", "date", "issued", "updated", "modified"):
+        el = children.get(key)
+        if el is not None and (el.text or "").strip():
+            st = _parse_date(el.text.strip())
+            if st:
+                # 与collect_news.parse_published一致
+                return datetime.fromtimestamp(time.mktime(st), tz=timezone.utc)
+    return None
+
+
+def _link(el: etree._Element, children: Dict[str, etree._Element]) -> Optional[str]:
+    links = [c for c in el if _local(c.tag) == "link"]
+    for c in links:
+        # Atom: <link rel="alternate" href=...>，rel缺省即alternate
+        if c.get("href") and c.get("rel", "alternate") == "alternate":
+            return c.get("href").strip()
+    for c in links:
+        if (c.text or "").strip():
+            return c.text.strip()
+    guid = children.get("guid")
+    if guid is not None and guid.get("isPermaLink", "true") == "true" and (guid.text or "").strip():
+        return guid.text.strip()
+    return None
+
+
+def entry_from_element(el: etree._Element) -> Dict[str, Any]:
+    """返回 {"url", "title", "summary", "published": datetime|None}"""
+    children: Dict[str, etree._Element] = {}
+    for c in el:
+        children.setdefault(_local(c.tag), c)
+    summary = children.get("description")
+    if summary is None:
+        summary = children.get("summary")
+    if summary is None:
+        summary = children.get("encoded") if children.get("encoded") is not None else children.get("content")
+    return {
+        "url": _link(el, children),
+        "title": _text(children.get("title")),
+        "summary": _text(summary),
+        "published": _published(children),
+    }
+
+
+class FeedStream:
+    """逐块喂入feed字节，返回本块中已完整解析的条目；格式错误时抛出etree.XMLSyntaxError"""
+
+    def __init__(self) -> None:
+        self.parser = etree.XMLPullParser(events=("end",), resolve_entities=False, no_network=True)
+        self.entries_seen = 0
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        out = []
+        for _, el in self.parser.read_events():
+            if _local(el.tag) not in ENTRY_TAGS:
+                continue
+            out.append(entry_from_element(el))
+            self.entries_seen += 1
+            # 已处理的条目及其前面的兄弟节点不再需要
+            el.clear()
+            parent = el.getparent()
+            if parent is not None:
+                while el.getprevious() is not None:
+                    del parent[0]
+        return out
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        self.parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, Any]]:
+        self.parser.close()
+        return self._drain()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""原始HTML归档：按内容哈希去重存储（zstd压缩，缺少zstandard时退回gzip），SQLite索引URL与抓取时间"""
+
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖
+    zstandard = None
+
+
+def _compress(body: bytes) -> tuple:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(body), "zst"
+    return gzip.compress(body, compresslevel=6), "gz"
+
+
+def read_object(path: str) -> bytes:
+    """读取并解压一个归档对象（可在子进程中调用）"""
+    data = Path(path).read_bytes()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst archive objects")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class HtmlArchive:
+    def __init__(self, root: str):
+        self.root = Path(root)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 抓取线程会并发写入
+        self.conn = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fetches (
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                digest TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                content_type TEXT,
+                size INTEGER
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_fetches_url ON fetches(url, fetched_at)")
+        self.conn.commit()
+
+    def object_path(self, digest: str, codec: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.html.{codec}"
+
+    def put(self, url: str, body: bytes, content_type: str = "") -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            row = self.conn.execute("SELECT codec FROM fetches WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if row and self.object_path(digest, row["codec"]).exists():
+                codec = row["codec"]
+            else:
+                data, codec = _compress(body)
+                path = self.object_path(digest, codec)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+            self.conn.execute(
+                "INSERT INTO fetches (url, fetched_at, digest, codec, content_type, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, time.time(), digest, codec, content_type, len(body)),
+            )
+            self.conn.commit()
+        return digest
+
+    def latest(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """每个URL最近一次抓取的记录（附对象路径）"""
+        rows = self.conn.execute(
+            """
+            SELECT url, MAX(fetched_at) AS fetched_at, digest, codec, content_type, size
+            FROM fetches WHERE fetched_at >= ? GROUP BY url ORDER BY fetched_at DESC
+            """,
+            (since or 0,),
+        ).fetchall()
+        out = []
+        for r in rows:
+            d = dict(r)
+            d["path"] = str(self.object_path(d["digest"], d["codec"]))
+            out.append(d)
+        return out
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""遵循HTTP缓存语义的页面缓存（Cache-Control/Expires/max-age、ETag/Last-Modified验证、stale-while-revalidate），同步脚本与异步采集器共用"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# 只缓存这些状态码的响应（RFC 9111中默认可缓存且对采集有用的）
+CACHEABLE_STATUS = {200, 203}
+# 无显式过期信息但有Last-Modified时的启发式新鲜期：距上次修改时长的10%，封顶1天
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX = 86400
+# 元数据里保留的响应头
+KEEP_HEADERS = ("cache-control", "expires", "date", "age", "etag", "last-modified", "content-type", "vary")
+# 两次清理之间至少间隔（秒），清理要读遍所有元数据
+PRUNE_INTERVAL = 86400
+
+FRESH = "fresh"
+STALE_REVALIDATE = "stale_while_revalidate"
+STALE = "stale"
+
+
+def cache_control(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """解析Cache-Control：{"max-age": "60", "no-cache": None, ...}"""
+    out: Dict[str, Optional[str]] = {}
+    for part in (headers.get("cache-control") or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            out[name.strip().lower()] = value.strip().strip('"') or None
+    return out
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers: Dict[str, str], default_ttl: float = 0) -> float:
+    """max-age > Expires-Date > Last-Modified启发式 > default_ttl（秒）"""
+    cc = cache_control(headers)
+    max_age = _seconds(cc.get("max-age"))
+    if max_age is not None:
+        return max_age
+    date = _http_date(headers.get("date"))
+    if "expires" in headers:
+        # 无法解析的Expires（如"0"）视为已过期
+        expires = _http_date(headers.get("expires"))
+        return max(0.0, expires - (date or time.time())) if expires else 0.0
+    modified = _http_date(headers.get("last-modified"))
+    if modified:
+        return min(HEURISTIC_MAX, max(0.0, ((date or time.time()) - modified) * HEURISTIC_FRACTION))
+    return default_ttl
+
+
+def is_storable(status: int, headers: Dict[str, str]) -> bool:
+    cc = cache_control(headers)
+    return status in CACHEABLE_STATUS and "no-store" not in cc and headers.get("vary", "").strip() != "*"
+
+
+class HttpCache:
+    def __init__(self, root: str, default_ttl: float = 0, revalidate_workers: int = 2):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # 响应完全没有过期信息时的新鲜期（0=每次都验证）
+        self.default_ttl = default_ttl
+        self.revalidate_workers = revalidate_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        # 按lookup结果计数（miss/fresh/stale_while_revalidate/stale），另有revalidated: 304后沿用; stored: 写入
+        self.stats: Counter = Counter()
+
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = self.root / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".body.gz")
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """返回缓存条目 {"url","status","headers","body","state"}；state为fresh/stale_while_revalidate/stale"""
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = gzip.decompress(body_path.read_bytes())
+        except (OSError, ValueError):
+            self._bump("miss")
+            return None
+        headers = meta["headers"]
+        cc = cache_control(headers)
+        # Age + 入库后经过的时间（Date与本地时钟的偏差由apparent age修正）
+        date = _http_date(headers.get("date")) or meta["stored_at"]
+        age = max(0.0, meta["stored_at"] - date, float(_seconds(headers.get("age")) or 0))
+        age += time.time() - meta["stored_at"]
+        lifetime = freshness_lifetime(headers, self.default_ttl)
+        swr = _seconds(cc.get("stale-while-revalidate")) or 0
+        if "no-cache" in cc:
+            state = STALE
+        elif age < lifetime:
+            state = FRESH
+        elif age < lifetime + swr and "must-revalidate" not in cc:
+            state = STALE_REVALIDATE
+        else:
+            state = STALE
+        self._bump(state)
+        return {"url": url, "status": meta["status"], "headers": headers, "body": body, "state": state}
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        if not entry:
+            return {}
+        out = {}
+        if entry["headers"].get("etag"):
+            out["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            out["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return out
+
+    def store(self, url: str, status: int, headers: Iterable[Tuple[str, str]], body: bytes) -> bool:
+        """写入一个完整响应；不可缓存（no-store、非200等）时删除旧条目并返回False"""
+        kept = {k.lower(): v for k, v in headers if k.lower() in KEEP_HEADERS}
+        meta_path, body_path = self._paths(url)
+        if not is_storable(status, kept):
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            return False
+        # 先写正文再写元数据：有元数据即代表条目完整
+        self._write(body_path, gzip.compress(body, compresslevel=6))
+        meta = {"url": url, "status": status, "headers": kept, "stored_at": time.time()}
+        self._write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        self._bump("stored")
+        return True
+
+    def refresh(self, url: str, entry: Dict[str, Any], headers: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """304：用新响应头更新条目并重置入库时间，返回更新后的条目"""
+        merged = dict(entry["headers"])
+        # 304不带正文，Content-Type沿用原响应
+        merged.update({k.lower(): v for k, v in headers if k.lower() in KEEP_HEADERS and k.lower() != "content-type"})
+        meta = {"url": url, "status": entry["status"], "headers": merged, "stored_at": time.time()}
+        self._write(self._paths(url)[0], json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        self._bump("revalidated")
+        return dict(entry, headers=merged, state=FRESH)
+
+    def begin_revalidation(self, url: str) -> bool:
+        """登记一次后台验证；同一URL已在验证中时返回False"""
+        with self._lock:
+            if url in self._pending:
+                return False
+            self._pending.add(url)
+            return True
+
+    def end_revalidation(self, url: str) -> None:
+        with self._lock:
+            self._pending.discard(url)
+
+    def revalidate_later(self, url: str, fn: Callable[[], Any]) -> None:
+        """stale-while-revalidate：在后台线程执行fn（同步调用方用；异步调用方用begin/end_revalidation自建task）"""
+        if not self.begin_revalidation(url):
+            return
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.revalidate_workers)
+
+        def run() -> None:
+            try:
+                fn()
+            except Exception:
+                pass
+            finally:
+                self.end_revalidation(url)
+
+        self._pool.submit(run)
+
+    def prune(self, max_age_days: float) -> int:
+        """删除过期已超过max_age_days的条目及残留的正文/临时文件，返回删除的条目数；每PRUNE_INTERVAL最多执行一次"""
+        marker = self.root / ".pruned"
+        now = time.time()
+        try:
+            if now - marker.stat().st_mtime < PRUNE_INTERVAL:
+                return 0
+        except OSError:
+            pass
+        cutoff = now - max_age_days * 86400
+        removed = 0
+        for meta_path in self.root.glob("*/*.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                cc = cache_control(meta["headers"])
+                expires = meta["stored_at"] + freshness_lifetime(meta["headers"], self.default_ttl)
+                expires += _seconds(cc.get("stale-while-revalidate")) or 0
+            except (OSError, ValueError, KeyError, TypeError):
+                expires = 0
+            if expires < cutoff:
+                # 先删元数据：没有元数据的条目即视为不存在
+                meta_path.unlink(missing_ok=True)
+                meta_path.with_name(meta_path.stem + ".body.gz").unlink(missing_ok=True)
+                removed += 1
+        for path in self.root.glob("*/*"):
+            # 没有元数据的正文（写入中断）与临时文件
+            orphan = path.name.endswith(".body.gz") and not path.with_name(path.name.split(".")[0] + ".json").exists()
+            try:
+                if (orphan or path.suffix == ".tmp") and path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+        marker.touch()
+        self._bump("pruned", removed)
+        return removed
+
+    def close(self) -> None:
+        """等待后台验证完成"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""HTTP录制/回放：在requests适配器和httpx传输层拦截请求，录制模式把响应存入本地cassette，回放模式离线按原样返回（可模拟延迟）
+
+用法（各脚本入口调用 install_from_env()）：
+  NEWS_HTTP_MODE=record NEWS_HTTP_CASSETTE=data/cassettes/run1 python3 scripts/collect_news.py ...
+  NEWS_HTTP_MODE=replay NEWS_HTTP_CASSETTE=data/cassettes/run1 NEWS_HTTP_LATENCY=recorded python3 scripts/collect_news.py ...
+NEWS_HTTP_LATENCY: 空=不延迟；recorded=按录制时的耗时；数字=固定毫秒
+
+条件请求头（If-None-Match/If-Modified-Since）取决于运行前的缓存状态，回放无精确匹配时退回到不带这些头的录制；
+录制时最好从空状态开始（如 --refetch 并把 --feed-state/--http-cache 指向空路径），这样录到的都是完整响应而不是304。
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+try:
+    import httpx
+except ImportError:  # httpx只在异步采集器中使用
+    httpx = None
+
+# 参与匹配的请求头：条件请求与Range请求的响应不同
+KEY_HEADERS = ("if-none-match", "if-modified-since", "range")
+# 回放无精确匹配时忽略这些头再查一次
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+# 录制的是解码后的正文，这些头不再成立
+DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+# recorded: 录制条数; replayed: 回放命中; fallback: 其中按无条件请求命中; missed: 回放未命中（按连接错误处理）
+REPLAY_STATS: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def _bump(key: str) -> None:
+    with _stats_lock:
+        REPLAY_STATS[key] += 1
+
+
+def request_key(
+    method: str, url: str, headers: Dict[str, str], body: Optional[bytes], conditional: bool = True
+) -> str:
+    """method + 规范化URL（查询参数排序）+ 关键请求头 + 请求体摘要；conditional=False时不计条件请求头"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    norm = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+    lower = {k.lower(): v for k, v in headers.items()}
+    names = KEY_HEADERS if conditional else [h for h in KEY_HEADERS if h not in CONDITIONAL_HEADERS]
+    extra = "|".join(f"{h}={lower[h]}" for h in names if lower.get(h))
+    digest = hashlib.sha1(body).hexdigest() if body else ""
+    return hashlib.sha1(f"{method.upper()} {norm} {extra} {digest}".encode("utf-8")).hexdigest()
+
+
+def request_keys(method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> Tuple[str, str]:
+    """(精确键, 无条件请求键)；请求不带条件头时两者相同"""
+    return request_key(method, url, headers, body), request_key(method, url, headers, body, conditional=False)
+
+
+class Cassette:
+    """每个响应两个文件：<key>.json（状态、头、耗时）与<key>.bin（解码后的正文）"""
+
+    def __init__(self, path: str, latency: Optional[str] = None):
+        self.path = Path(path)
+        self.latency = (latency or "").strip()
+
+    def _files(self, key: str) -> Tuple[Path, Path]:
+        base = self.path / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".bin")
+
+    def save(
+        self,
+        keys: Tuple[str, str],
+        method: str,
+        url: str,
+        status: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        elapsed_ms: float,
+    ) -> Dict[str, Any]:
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": [[k, v] for k, v in headers if k.lower() not in DROP_HEADERS],
+            "elapsed_ms": round(elapsed_ms, 1),
+            "recorded_at": time.time(),
+        }
+        exact, plain = keys
+        # 条件请求拿到的完整响应同样可以回答无条件请求；304则不行
+        for key in (exact, plain) if plain != exact and status != 304 else (exact,):
+            meta_path, body_path = self._files(key)
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写正文再写元数据：有元数据即代表条目完整
+            for p, data in ((body_path, body), (meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))):
+                tmp = p.with_suffix(p.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                tmp.replace(p)
+        _bump("recorded")
+        return meta
+
+    def load(self, keys: Tuple[str, str]) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """先按精确键查；没有时退回无条件请求的录制（服务端忽略条件头时也会这样回答）"""
+        for key in dict.fromkeys(keys):
+            meta_path, body_path = self._files(key)
+            if meta_path.exists():
+                _bump("replayed")
+                if key != keys[0]:
+                    _bump("fallback")
+                return json.loads(meta_path.read_text(encoding="utf-8")), body_path.read_bytes()
+        _bump("missed")
+        return None
+
+    def delay(self, meta: Dict[str, Any]) -> float:
+        """回放前应等待的秒数"""
+        if not self.latency:
+            return 0.0
+        if self.latency == "recorded":
+            return meta.get("elapsed_ms", 0) / 1000
+        return float(self.latency) / 1000
+
+
+_mode: Optional[str] = None
+_cassette: Optional[Cassette] = None
+_originals: Dict[str, Any] = {}
+
+
+def _requests_send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+    body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+    keys = request_keys(request.method, request.url, request.headers, body if isinstance(body, bytes) else None)
+    if _mode == "record":
+        t0 = time.monotonic()
+        resp = _originals["requests"](self, request, True, timeout, verify, cert, proxies)
+        try:
+            content = resp.content
+        finally:
+            resp.close()
+        elapsed = (time.monotonic() - t0) * 1000
+        headers = list(resp.headers.items())
+        meta = _cassette.save(keys, request.method, request.url, resp.status_code, headers, content, elapsed)
+    else:
+        loaded = _cassette.load(keys)
+        if loaded is None:
+            raise requests.ConnectionError(f"no recorded response for {request.method} {request.url}", request=request)
+        meta, content = loaded
+        wait = _cassette.delay(meta)
+        if wait:
+            time.sleep(wait)
+    # 录制时也返回由录制内容构造的响应，两种模式下调用方看到的完全一致
+    raw = HTTPResponse(
+        body=io.BytesIO(content),
+        headers=meta["headers"],
+        status=meta["status"],
+        preload_content=False,
+        decode_content=False,
+    )
+    # build_response负责url/encoding/cookies，和真实请求的返回一致
+    return self.build_response(request, raw)
+
+
+def _httpx_keys(request) -> Tuple[str, str]:
+    return request_keys(request.method, str(request.url), request.headers, request.content)
+
+
+def _httpx_record(request, resp, content: bytes, elapsed_ms: float):
+    headers = list(resp.headers.multi_items())
+    meta = _cassette.save(
+        _httpx_keys(request), request.method, str(request.url), resp.status_code, headers, content, elapsed_ms
+    )
+    return httpx.Response(meta["status"], headers=meta["headers"], content=content, request=request)
+
+
+def _httpx_replay(request) -> Tuple[Any, float]:
+    """返回 (响应, 应等待秒数)"""
+    loaded = _cassette.load(_httpx_keys(request))
+    if loaded is None:
+        raise httpx.ConnectError(f"no recorded response for {request.method} {request.url}", request=request)
+    meta, content = loaded
+    resp = httpx.Response(meta["status"], headers=meta["headers"], content=content, request=request)
+    return resp, _cassette.delay(meta)
+
+
+def _httpx_handle(self, request):
+    request.read()
+    if _mode == "record":
+        t0 = time.monotonic()
+        resp = _originals["httpx"](self, request)
+        try:
+            content = resp.read()
+        finally:
+            resp.close()
+        return _httpx_record(request, resp, content, (time.monotonic() - t0) * 1000)
+    resp, wait = _httpx_replay(request)
+    if wait:
+        time.sleep(wait)
+    return resp
+
+
+async def _httpx_handle_async(self, request):
+    await request.aread()
+    if _mode == "record":
+        t0 = time.monotonic()
+        resp = await _originals["httpx_async"](self, request)
+        try:
+            content = await resp.aread()
+        finally:
+            await resp.aclose()
+        return _httpx_record(request, resp, content, (time.monotonic() - t0) * 1000)
+    resp, wait = _httpx_replay(request)
+    if wait:
+        await asyncio.sleep(wait)
+    return resp
+
+
+def install(mode: str, path: str, latency: Optional[str] = None) -> None:
+    """在本进程内启用录制/回放（对所有requests会话和httpx客户端生效）；mode为off时恢复直连"""
+    global _mode, _cassette
+    if mode not in ("record", "replay", "off"):
+        raise ValueError(f"unknown http replay mode: {mode}")
+    if mode == "off":
+        uninstall()
+        return
+    _mode, _cassette = mode, Cassette(path, latency)
+    if "requests" not in _originals:
+        _originals["requests"] = HTTPAdapter.send
+        HTTPAdapter.send = _requests_send
+    if httpx is not None and "httpx" not in _originals:
+        _originals["httpx"] = httpx.HTTPTransport.handle_request
+        _originals["httpx_async"] = httpx.AsyncHTTPTransport.handle_async_request
+        httpx.HTTPTransport.handle_request = _httpx_handle
+        httpx.AsyncHTTPTransport.handle_async_request = _httpx_handle_async
+
+
+def uninstall() -> None:
+    global _mode, _cassette
+    if "requests" in _originals:
+        HTTPAdapter.send = _originals.pop("requests")
+    if "httpx" in _originals:
+        httpx.HTTPTransport.handle_request = _originals.pop("httpx")
+        httpx.AsyncHTTPTransport.handle_async_request = _originals.pop("httpx_async")
+    _mode, _cassette = None, None
+
+
+def state_path(path: str) -> str:
+    """回放模式下把跨运行的状态文件/目录重定向到 <cassette>/state/ 下，其他模式（及空路径）原样返回"""
+    if _mode != "replay" or not path:
+        return path
+    return str(_cassette.path / "state" / Path(path).name)
+
+
+def install_from_env() -> Optional[str]:
+    """读取NEWS_HTTP_MODE/NEWS_HTTP_CASSETTE/NEWS_HTTP_LATENCY；未设置时不做任何事。返回生效的模式
+
+    回放运行应使用隔离的状态：入口脚本对熔断/负缓存/条件请求/HTTP缓存等路径调用 state_path()，
+    否则回放未命中会写进正式运行的状态文件。
+    """
+    mode = (os.getenv("NEWS_HTTP_MODE") or "").strip().lower()
+    if not mode or mode == "off":
+        return None
+    install(mode, os.getenv("NEWS_HTTP_CASSETTE") or "data/cassettes/default", os.getenv("NEWS_HTTP_LATENCY"))
+    return mode
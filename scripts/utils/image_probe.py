@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""封面候选探测：只下载图片头部几KB（Range请求/流式读取后中断），解析格式与尺寸，按尺寸和宽高比排序"""
+
+import struct
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+HEAD_BYTES = 16 * 1024
+# JPEG的SOF可能排在较大的EXIF/ICC段之后
+MAX_PROBE_BYTES = 128 * 1024
+
+MIN_WIDTH = 300
+MIN_HEIGHT = 150
+
+# probed: 探测次数; ok: 解析出尺寸; bytes: 探测读取的字节; ranged: 服务器支持Range(206)
+PROBE_STATS: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+            i += 1 if marker == 0xFF else 2
+            continue
+        seg_len = struct.unpack(">H", data[i + 2 : i + 4])[0]
+        # SOF0-SOF15（排除DHT/JPG/DAC）
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h, w = struct.unpack(">HH", data[i + 5 : i + 9])
+            return w, h
+        i += 2 + seg_len
+    return None
+
+
+def sniff_image(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """从图片头部解析 (format, width, height)；数据不足或格式不支持时返回None"""
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and len(data) >= 24:
+        w, h = struct.unpack(">II", data[16:24])
+        return "png", w, h
+    if data[:6] in (b"GIF87a", b"GIF89a") and len(data) >= 10:
+        w, h = struct.unpack("<HH", data[6:10])
+        return "gif", w, h
+    if data.startswith(b"\xff\xd8"):
+        size = _jpeg_size(data)
+        return ("jpg",) + size if size else None
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP" and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return "webp", w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            b = data[21:25]
+            w = 1 + (((b[1] & 0x3F) << 8) | b[0])
+            h = 1 + (((b[3] & 0x0F) << 10) | (b[2] << 2) | ((b[1] & 0xC0) >> 6))
+            return "webp", w, h
+        if chunk == b"VP8X":
+            w = 1 + int.from_bytes(data[24:27], "little")
+            h = 1 + int.from_bytes(data[27:30], "little")
+            return "webp", w, h
+    if data[:2] == b"BM" and len(data) >= 26:
+        w, h = struct.unpack("<ii", data[18:26])
+        return "bmp", w, abs(h)
+    return None
+
+
+def probe_image(
+    url: str,
+    session: Optional[requests.Session] = None,
+    timeout: float = 10,
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """只读取足够解析尺寸的前缀；返回 {"url", "format", "width", "height"} 或None"""
+    hdrs = dict(headers or {})
+    hdrs["Range"] = f"bytes=0-{HEAD_BYTES - 1}"
+    buf = b""
+    result = None
+    try:
+        with (session or requests).get(url, headers=hdrs, timeout=timeout, stream=True) as r:
+            r.raise_for_status()
+            # 不支持Range的服务器返回200全量，读到够用即断开
+            for chunk in r.iter_content(chunk_size=4096):
+                buf += chunk
+                result = sniff_image(buf)
+                if result or len(buf) >= MAX_PROBE_BYTES:
+                    break
+            ranged = r.status_code == 206
+    except Exception:
+        ranged = False
+    with _stats_lock:
+        PROBE_STATS.update(probed=1, bytes=len(buf), ok=1 if result else 0, ranged=1 if ranged else 0)
+    if not result:
+        return None
+    fmt, w, h = result
+    return {"url": url, "format": fmt, "width": w, "height": h}
+
+
+def cover_score(info: Dict[str, Any]) -> float:
+    """面积（封顶1920x1080）乘以宽高比系数；过小、过窄/过长（横幅、logo条）记0"""
+    w, h = info["width"], info["height"]
+    if w < MIN_WIDTH or h < MIN_HEIGHT:
+        return 0.0
+    ratio = w / h
+    if ratio > 3.5 or ratio < 0.6:
+        return 0.0
+    # 横图（约4:3到2:1）最适合做封面
+    aspect = 1.0 if 1.3 <= ratio <= 2.0 else 0.6
+    if info.get("format") == "gif":
+        aspect *= 0.5
+    return min(w * h, 1920 * 1080) / (1920 * 1080) * aspect
+
+
+def rank_candidates(
+    urls: List[str],
+    session: Optional[requests.Session] = None,
+    workers: int = 6,
+    timeout: float = 10,
+    headers: Optional[Dict[str, str]] = None,
+    probed: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """并发探测候选图片，返回可用候选（score>0），按分数降序；同分保持原顺序
+
+    probed给出时填入所有探测成功的结果（含score为0、被淘汰的），用于区分"都探测不到"和"探测到但都不合格"
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+        infos = list(pool.map(lambda u: probe_image(u, session, timeout, headers), urls))
+    if probed is not None:
+        probed.extend(info for info in infos if info)
+    ranked = []
+    for info in infos:
+        if info:
+            info["score"] = round(cover_score(info), 4)
+            if info["score"] > 0:
+                ranked.append(info)
+    ranked.sort(key=lambda x: -x["score"])
+    return ranked
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""失败URL的负缓存：按失败类型设定屏蔽时长（404/410长、超时/5xx短），重复失败时指数增长；状态跨运行持久化"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# 各失败类型的首次屏蔽时长与上限（秒）；连续失败n次时为 基础时长*2^(n-1)，不超过上限
+TTL_BY_KIND = {
+    "gone": 7 * 86400,  # 404/410：页面已删除
+    "forbidden": 86400,  # 401/403：被拒绝访问
+    "server": 600,  # 5xx/429：服务端暂时故障或限流
+    "timeout": 600,
+    "error": 300,  # 连接失败等其他网络错误
+}
+MAX_TTL_BY_KIND = {"gone": 60 * 86400, "forbidden": 7 * 86400, "server": 6 * 3600, "timeout": 6 * 3600, "error": 3600}
+# 到期后仍保留失败次数的时长，期间再次失败按更长时长屏蔽
+FORGET_SECONDS = 7 * 86400
+
+
+def classify(status: Optional[int] = None, timeout: bool = False) -> Optional[str]:
+    """失败类型；不应缓存的失败（如其他4xx）返回None"""
+    if timeout:
+        return "timeout"
+    if status is None:
+        return "error"
+    if status in (404, 410):
+        return "gone"
+    if status in (401, 403):
+        return "forbidden"
+    if status == 429 or status >= 500:
+        return "server"
+    return None
+
+
+class NegativeCache:
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        # 本进程内改动/清除过的URL，保存时与文件中其他进程的记录合并
+        self._dirty: set = set()
+        # hit: 命中而直接失败; recorded: 记录失败; cleared: 成功后清除
+        self.stats: Counter = Counter()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8")).get("urls", {})
+        except Exception:
+            return {}
+
+    def check(self, url: str) -> Optional[Dict[str, Any]]:
+        """屏蔽期内返回记录 {"kind","status","failures","until",...}（计入hit），否则返回None"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry or time.time() >= entry["until"]:
+                return None
+            self.stats["hit"] += 1
+            self.stats[f"hit_{entry['kind']}"] += 1
+            return entry
+
+    def blocked(self, url: str) -> bool:
+        """是否在屏蔽期内（不计入统计）"""
+        with self._lock:
+            entry = self.entries.get(url)
+            return bool(entry) and time.time() < entry["until"]
+
+    def record(self, url: str, kind: str, status: Optional[int] = None, error: Any = None) -> float:
+        """记录一次失败，返回屏蔽秒数"""
+        with self._lock:
+            now = time.time()
+            prev = self.entries.get(url)
+            # 同类失败且未被遗忘时累加次数；类型变化（如超时变成404）重新计数
+            failures = prev["failures"] + 1 if prev and prev["kind"] == kind and now < prev["forget_at"] else 1
+            ttl = min(TTL_BY_KIND[kind] * 2 ** (failures - 1), MAX_TTL_BY_KIND[kind])
+            self.entries[url] = {
+                "kind": kind,
+                "status": status,
+                "failures": failures,
+                "until": now + ttl,
+                "forget_at": now + ttl + FORGET_SECONDS,
+                "error": str(error)[:200] if error is not None else None,
+            }
+            self._dirty.add(url)
+            self.stats["recorded"] += 1
+            return ttl
+
+    def clear(self, url: str) -> None:
+        """请求成功：删除记录"""
+        with self._lock:
+            if self.entries.pop(url, None) is not None:
+                self._dirty.add(url)
+                self.stats["cleared"] += 1
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            merged = self._load()
+            for url in self._dirty:
+                if url in self.entries:
+                    merged[url] = self.entries[url]
+                else:
+                    merged.pop(url, None)
+            now = time.time()
+            merged = {u: e for u, e in merged.items() if now < e["forget_at"]}
+            tmp.write_text(json.dumps({"urls": merged}, ensure_ascii=False, indent=1), encoding="utf-8")
+            tmp.replace(self.path)
+            self.entries, self._dirty = merged, set()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""新闻素材payload读写：兼容旧的整块JSON，以及流式JSONL（首行为头信息meta/count，之后每行一个item）
+
+命令行读取头字段（不解析条目）：
+  python3 scripts/utils/news_payload.py data/raw/news_x.jsonl --field count
+"""
+
+import argparse
+import itertools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def is_jsonl(path) -> bool:
+    return str(path).endswith(".jsonl")
+
+
+class JsonlPayloadWriter:
+    """条目边产生边写入临时文件；finish时写入头行并原子替换，读者不会看到半成品"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._items_path = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".items", dir=str(self.path.parent))
+        self._items = os.fdopen(fd, "w", encoding="utf-8")
+        self.count = 0
+
+    def add(self, item: Dict[str, Any]) -> None:
+        self._items.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def finish(self, header: Dict[str, Any]) -> None:
+        header = {k: v for k, v in header.items() if k != "items"}
+        header.setdefault("count", self.count)
+        header["format"] = "jsonl"
+        self._items.close()
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as out, open(self._items_path, "r", encoding="utf-8") as items:
+            out.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for line in items:
+                out.write(line)
+        tmp.replace(self.path)
+        os.unlink(self._items_path)
+
+    def abort(self) -> None:
+        self._items.close()
+        if os.path.exists(self._items_path):
+            os.unlink(self._items_path)
+
+
+def write_payload(payload: Dict[str, Any], path) -> None:
+    """按扩展名写出：.jsonl 为流式格式，其余为旧的 indent=2 JSON"""
+    path = Path(path)
+    if is_jsonl(path):
+        w = JsonlPayloadWriter(path)
+        for it in payload.get("items") or []:
+            w.add(it)
+        w.finish(payload)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def read_header(path) -> Dict[str, Any]:
+    """只读头信息（JSONL只读第一行；旧JSON需整体解析，返回时去掉items）"""
+    if is_jsonl(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.loads(f.readline() or "{}")
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {k: v for k, v in payload.items() if k != "items"}
+
+
+def iter_items(path, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """逐条读取items；JSONL按行惰性解析，limit之后的行不会被读取"""
+    if is_jsonl(path):
+        with open(path, "r", encoding="utf-8") as f:
+            f.readline()
+            lines = (ln for ln in f if ln.strip())
+            for ln in itertools.islice(lines, limit):
+                yield json.loads(ln)
+        return
+    items: List[Dict[str, Any]] = json.loads(Path(path).read_text(encoding="utf-8")).get("items") or []
+    yield from itertools.islice(items, limit)
+
+
+def load_payload(path, limit: Optional[int] = None) -> Dict[str, Any]:
+    """读成旧的payload形状（头信息 + items列表）"""
+    payload = read_header(path)
+    payload.pop("format", None)
+    payload["items"] = list(iter_items(path, limit))
+    return payload
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path")
+    ap.add_argument("--field", default="", help="打印头信息中的单个字段（缺失时打印0）")
+    args = ap.parse_args()
+    header = read_header(args.path)
+    if args.field:
+        print(header.get(args.field, 0))
+    else:
+        print(json.dumps(header, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
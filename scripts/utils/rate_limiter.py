@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""按主机的令牌桶限速（asyncio）：同一主机的请求按速率排队，不同主机互不等待"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = 0.5, burst: int = 1):
+        # rate: 每秒补充的令牌数（每主机）；burst: 桶容量，即空闲后可连续发出的请求数
+        self.rate = max(rate, 1e-6)
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # waits: 需要等待的次数; waited_s: 累计等待秒数
+        self.stats: Counter = Counter()
+
+    async def acquire(self, url: str) -> float:
+        """取一个令牌，必要时等待；返回等待的秒数"""
+        host = (urlparse(url).hostname or "").lower()
+        # 同一主机按到达顺序排队，等待期间不影响其他主机
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens < 1:
+                wait = (1 - tokens) / self.rate
+                self.stats["waits"] += 1
+                self.stats["waited_s"] += wait
+                await asyncio.sleep(wait)
+                tokens, now = 1.0, time.monotonic()
+            self._buckets[host] = (tokens - 1, now)
+            return wait
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""已处理URL台账（SQLite）：跨运行去重、复用正文提取结果、记录被哪篇文章引用"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+class SeenLedger:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                title TEXT,
+                text_hash TEXT,
+                content_text TEXT,
+                cover_image_url TEXT,
+                used_in_post TEXT
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen(last_seen)")
+        self.conn.commit()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        by_hash = {url_hash(u): u for u in urls}
+        out: Dict[str, Dict[str, Any]] = {}
+        keys = list(by_hash)
+        # SQLite 默认最多 999 个绑定参数
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            rows = self.conn.execute(
+                f"SELECT * FROM seen WHERE url_hash IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for row in rows:
+                out[by_hash[row["url_hash"]]] = dict(row)
+        return out
+
+    def record(self, url: str, title: str, content_text: str, cover_image_url: Optional[str]) -> None:
+        now = time.time()
+        text_hash = hashlib.sha1((content_text or "").encode("utf-8")).hexdigest()
+        self.conn.execute(
+            """
+            INSERT INTO seen (url_hash, url, first_seen, last_seen, title, text_hash, content_text, cover_image_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url_hash) DO UPDATE SET
+                last_seen = excluded.last_seen,
+                title = excluded.title,
+                text_hash = excluded.text_hash,
+                content_text = excluded.content_text,
+                cover_image_url = excluded.cover_image_url
+            """,
+            (url_hash(url), url, now, now, title, text_hash, content_text, cover_image_url),
+        )
+
+    def touch(self, urls: Iterable[str]) -> None:
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE seen SET last_seen = ? WHERE url_hash = ?", [(now, url_hash(u)) for u in urls]
+        )
+
+    def mark_used(self, urls: List[str], slug: str) -> None:
+        now = time.time()
+        self.conn.executemany(
+            """
+            INSERT INTO seen (url_hash, url, first_seen, last_seen, used_in_post)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(url_hash) DO UPDATE SET used_in_post = excluded.used_in_post
+            """,
+            [(url_hash(u), u, now, now, slug) for u in urls if u],
+        )
+        self.conn.commit()
+
+    def prune(self, max_age_days: float) -> int:
+        cutoff = time.time() - max_age_days * 86400
+        cur = self.conn.execute("DELETE FROM seen WHERE last_seen < ?", (cutoff,))
+        self.conn.commit()
+        return cur.rowcount
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""sitemap增量发现：读取sitemap.xml及sitemap索引，按lastmod只产出新增或更新过的URL（条目形状与RSS条目相同）"""
+
+import gzip
+import io
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import requests
+from lxml import etree
+
+from scripts.utils.capped_download import DeadlinePassed, abort_at
+
+# 索引中没有lastmod的子sitemap，每次最多看前几个（通常按时间倒序排列）
+MAX_UNDATED_CHILDREN = 3
+# lastmod变化过的子sitemap每次最多抓几个（子sitemap在单个抓取线程里串行请求）
+MAX_CHANGED_CHILDREN = 5
+# 因max_entries被截掉、留到下次产出的条目上限
+MAX_PENDING = 500
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# 已见URL保留天数
+SEEN_DAYS = 30
+
+
+def _local(tag: Any) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ""
+
+
+def _parse_lastmod(value: str) -> Optional[datetime]:
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _title_from_url(url: str) -> str:
+    """无news:title时用URL末段作临时标题（抓取正文后会被页面标题替换）"""
+    slug = unquote(urlparse(url).path.rstrip("/").rsplit("/", 1)[-1])
+    slug = re.sub(r"\.(s?html?|php|aspx?)$", "", slug)
+    return re.sub(r"[-_]+", " ", slug).strip()
+
+
+def iter_sitemap(body: bytes) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """逐条产出 ("url"|"sitemap", {"loc", "lastmod", "title", "published"})"""
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    for _, el in etree.iterparse(io.BytesIO(body), events=("end",), resolve_entities=False, no_network=True):
+        kind = _local(el.tag)
+        if kind not in ("url", "sitemap"):
+            continue
+        rec: Dict[str, str] = {}
+        for c in el.iter():
+            name = _local(c.tag)
+            text = (c.text or "").strip()
+            if name == "loc" and c.getparent() is el:
+                rec["loc"] = text
+            elif name == "lastmod":
+                rec["lastmod"] = text
+            elif name == "title":
+                rec["title"] = text
+            elif name == "publication_date":
+                rec["published"] = text
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+        if rec.get("loc"):
+            yield kind, rec
+
+
+class SitemapTracker:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.sitemaps: Dict[str, Dict[str, Any]] = {}
+        # 不同sitemap可能在抓取线程中并发发现
+        self._lock = threading.Lock()
+        if self.path.exists():
+            try:
+                self.sitemaps = json.loads(self.path.read_text(encoding="utf-8")).get("sitemaps", {})
+            except Exception:
+                self.sitemaps = {}
+
+    def _state(self, url: str) -> Dict[str, Any]:
+        with self._lock:
+            return self.sitemaps.setdefault(url, {"etag": None, "last_modified": None, "children": {}, "seen": {}})
+
+    def _fetch(
+        self, url: str, session: requests.Session, timeout: float, deadline: Optional[float] = None
+    ) -> Optional[bytes]:
+        """条件请求；304时返回None；deadline（time.monotonic()）到期时中断读取并抛出DeadlinePassed"""
+        st = self._state(url)
+        headers = {}
+        if st.get("etag"):
+            headers["If-None-Match"] = st["etag"]
+        if st.get("last_modified"):
+            headers["If-Modified-Since"] = st["last_modified"]
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as r, abort_at(r, deadline):
+            if r.status_code == 304:
+                return None
+            r.raise_for_status()
+            body = r.content
+        st["etag"] = r.headers.get("ETag")
+        st["last_modified"] = r.headers.get("Last-Modified")
+        return body
+
+    def discover(
+        self,
+        url: str,
+        session: requests.Session,
+        max_entries: int = 50,
+        match: Optional[str] = None,
+        timeout: float = 20,
+        deadline: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """返回新增/lastmod变化的页面条目 {"url", "title", "summary", "published"}，按lastmod倒序
+
+        deadline（time.monotonic()）到期后不再请求子sitemap，抛出DeadlinePassed
+        """
+        root = self._state(url)
+        pattern = re.compile(match) if match else None
+        now = time.time()
+        # 首次轮询：子sitemap只抓最近的几个，更早的只记基线，不补抓历史
+        first_poll = not root["children"]
+        found: Dict[str, Dict[str, Any]] = {}
+        # 上次因max_entries被截掉的条目：根或子sitemap之后可能304/lastmod不变、不会再被读到，从这里补回
+        with self._lock:
+            pending, root["pending"] = root.get("pending", []), []
+        for e in pending:
+            if e["url"] not in root["seen"]:
+                found[e["url"]] = e
+
+        def visit(sm_url: str, depth: int) -> None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlinePassed(f"{sm_url}: deadline passed")
+            body = self._fetch(sm_url, session, timeout, deadline)
+            if body is None:
+                return
+            children: List[Dict[str, Any]] = []
+            for kind, rec in iter_sitemap(body):
+                if kind == "sitemap":
+                    if depth < 2:
+                        children.append(rec)
+                    continue
+                loc = rec["loc"]
+                if pattern and not pattern.search(loc):
+                    continue
+                lastmod = rec.get("published") or rec.get("lastmod") or ""
+                seen = root["seen"].get(loc)
+                if seen is not None and seen[0] == lastmod:
+                    continue
+                published = _parse_lastmod(lastmod)
+                found[loc] = {
+                    "url": loc,
+                    "title": rec.get("title") or _title_from_url(loc),
+                    "summary": "",
+                    "published": published.isoformat() if published else None,
+                    "_lastmod": lastmod,
+                }
+
+            # 有lastmod的只看变化过的，最新的优先，每次最多MAX_CHANGED_CHILDREN个（其余留待下次轮询）；
+            # 没有lastmod的无法判断是否变化，只看前MAX_UNDATED_CHILDREN个（通常按时间倒序排列）
+            changed = [c for c in children if c.get("lastmod") and root["children"].get(c["loc"]) != c["lastmod"]]
+            changed.sort(key=lambda c: _parse_lastmod(c["lastmod"]) or EPOCH, reverse=True)
+            undated = [c for c in children if not c.get("lastmod")][:MAX_UNDATED_CHILDREN]
+            for i, c in enumerate(changed):
+                if i >= MAX_CHANGED_CHILDREN:
+                    if first_poll:
+                        root["children"][c["loc"]] = c["lastmod"]
+                    continue
+                visit(c["loc"], depth + 1)
+                root["children"][c["loc"]] = c["lastmod"]
+            for c in undated:
+                visit(c["loc"], depth + 1)
+                root["children"][c["loc"]] = ""
+
+        try:
+            visit(url, 0)
+        except Exception:
+            # 本次没能产出，补回的条目留到下次
+            with self._lock:
+                root["pending"] = [dict(e, _found_at=e.get("_found_at", now)) for e in found.values()][:MAX_PENDING]
+            raise
+        ordered = sorted(found.values(), key=lambda e: e["published"] or "", reverse=True)
+        out, rest = ordered[:max_entries], ordered[max_entries:]
+        with self._lock:
+            # 产出的URL记为已见；被截掉的记入pending，下次优先补回
+            for e in out:
+                root["seen"][e["url"]] = [e["_lastmod"], now]
+            root["pending"] = [dict(e, _found_at=e.get("_found_at", now)) for e in rest[:MAX_PENDING]]
+        return [{k: v for k, v in e.items() if not k.startswith("_")} for e in out]
+
+    def save(self) -> None:
+        cutoff = time.time() - SEEN_DAYS * 86400
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            for st in self.sitemaps.values():
+                st["seen"] = {u: v for u, v in st["seen"].items() if v[1] >= cutoff}
+                st["pending"] = [e for e in st.get("pending", []) if e.get("_found_at", 0) >= cutoff]
+            tmp.write_text(json.dumps({"sitemaps": self.sitemaps}, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
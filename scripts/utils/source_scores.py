@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""按来源的产出记分卡：新鲜命中率、正文提取成功率、平均耗时、被文章引用率；采集时据此决定feed抓取顺序"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# 历史不足时不降级；低于该分数的来源仅在条目不足时才抓取
+MIN_RUNS = 3
+DEFER_BELOW = 0.15
+# 被降级的来源超过该时长未抓取时照常抓取一次（探测），让好转的来源有机会恢复
+EXPLORE_AFTER = 86400
+# 每记录一次抓取，历史计数先乘以该系数（约等于只看最近10次），旧表现逐渐淡出
+DECAY = 0.9
+DECAYED = ("recent_runs", "fresh_runs", "fresh_entries", "pages_ok", "pages_failed", "emitted", "cited")
+
+
+class SourceScorecard:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                self.sources = json.loads(self.path.read_text(encoding="utf-8")).get("sources", {})
+            except Exception:
+                self.sources = {}
+
+    @staticmethod
+    def _blank() -> Dict[str, Any]:
+        return {
+            "runs": 0,
+            "recent_runs": 0,
+            "fresh_runs": 0,
+            "fresh_entries": 0,
+            "pages_ok": 0,
+            "pages_failed": 0,
+            "emitted": 0,
+            "cited": 0,
+            "latency_ms": 0.0,
+            "updated_at": 0,
+        }
+
+    def _source(self, name: str) -> Dict[str, Any]:
+        return self.sources.setdefault(name, self._blank())
+
+    def score(self, name: str) -> float:
+        """0~1；各比率带(1,2)平滑，新来源约为0.25，不会被降级"""
+        st = self.sources.get(name) or self._blank()
+        fresh_rate = (st["fresh_runs"] + 1) / (st.get("recent_runs", st["runs"]) + 2)
+        pages = st["pages_ok"] + st["pages_failed"]
+        extract_rate = (st["pages_ok"] + 1) / (pages + 2)
+        cite_rate = (st["cited"] + 1) / (st["emitted"] + 2)
+        return fresh_rate * (0.6 * extract_rate + 0.4 * cite_rate) / (1 + st["latency_ms"] / 10000)
+
+    def is_low_yield(self, name: str) -> bool:
+        """分数低且近期抓取过；长期未抓取的低分来源返回False，本次照常抓取以更新分数"""
+        st = self.sources.get(name)
+        if not st or st["runs"] < MIN_RUNS or time.time() - st["updated_at"] >= EXPLORE_AFTER:
+            return False
+        return self.score(name) < DEFER_BELOW
+
+    def record_feed(self, name: str, fresh: int, latency_ms: Optional[float]) -> None:
+        with self._lock:
+            st = self._source(name)
+            st.setdefault("recent_runs", st["runs"])
+            for key in DECAYED:
+                st[key] = round(st[key] * DECAY, 4)
+            st["runs"] += 1
+            st["recent_runs"] += 1
+            st["fresh_runs"] += 1 if fresh else 0
+            st["fresh_entries"] += fresh
+            if latency_ms is not None:
+                # 指数滑动平均，首次直接取值
+                st["latency_ms"] = latency_ms if st["runs"] == 1 else 0.7 * st["latency_ms"] + 0.3 * latency_ms
+            st["updated_at"] = time.time()
+
+    def record_pages(self, name: str, ok: int, failed: int, emitted: int) -> None:
+        with self._lock:
+            st = self._source(name)
+            st["pages_ok"] += ok
+            st["pages_failed"] += failed
+            st["emitted"] += emitted
+
+    def mark_cited(self, names: Iterable[str]) -> None:
+        """记录被文章引用的来源（只更新已有来源，热榜等临时来源忽略）"""
+        with self._lock:
+            for n in names:
+                if n in self.sources:
+                    self.sources[n]["cited"] += 1
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            data = {n: dict(st, score=round(self.score(n), 4)) for n, st in self.sources.items()}
+            tmp.write_text(json.dumps({"sources": data}, ensure_ascii=False, indent=1), encoding="utf-8")
+        tmp.replace(self.path)
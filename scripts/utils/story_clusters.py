@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""抓取正文前的近似重复聚类：标题+摘要分词后按Jaccard相似度合并，同一事件只抓代表条目"""
+
+import html
+import re
+from typing import Dict, List, Optional, Sequence, Set
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+CJK_RE = re.compile(r"[一-鿿]+")
+TAG_RE = re.compile(r"<[^>]+>")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "will", "with", "new", "says", "after",
+}
+
+
+def shingles(title: str, summary: str = "", summary_chars: int = 200) -> Set[str]:
+    """英文按词（去停用词），中文按字二元组；摘要只取开头，避免正文长度影响相似度"""
+    text = f"{title} {TAG_RE.sub(' ', html.unescape(summary or ''))[:summary_chars]}".lower()
+    out = {w for w in WORD_RE.findall(text) if w not in STOPWORDS and (len(w) > 1 or w.isdigit())}
+    for run in CJK_RE.findall(text):
+        out.update(run[i : i + 2] for i in range(len(run) - 1))
+    return out
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def cluster(docs: Sequence[Set[str]], threshold: float = 0.4, keys: Optional[Sequence[str]] = None) -> List[List[int]]:
+    """按输入顺序贪心聚类：条目与各组首条（代表）比较，加入相似度最高且达阈值的组，否则自成一组。
+
+    只与首条比较可避免模板化标题链式合并成一个大组；keys（来源名）给出时，
+    每组每个来源最多一条——同一feed里的不同条目不视为同一事件。
+    返回下标分组，组内及组间均保持输入顺序。
+    """
+    groups: List[List[int]] = []
+    group_keys: List[Set[str]] = []
+    # 倒排索引：shingle -> 以该shingle出现在首条中的组
+    index: Dict[str, List[int]] = {}
+    for i, doc in enumerate(docs):
+        key = keys[i] if keys is not None else None
+        best, best_sim = -1, threshold
+        for g in {g for sh in doc for g in index.get(sh, ())}:
+            if key is not None and key in group_keys[g]:
+                continue
+            sim = jaccard(doc, docs[groups[g][0]])
+            if sim >= best_sim:
+                best, best_sim = g, sim
+        if best >= 0:
+            groups[best].append(i)
+            if key is not None:
+                group_keys[best].add(key)
+            continue
+        groups.append([i])
+        group_keys.append({key} if key is not None else set())
+        for sh in doc:
+            index.setdefault(sh, []).append(len(groups) - 1)
+    return groups
@@ -0,0 +1,50 @@
+"""parse_feed_stream cutoff handling: stale entries are skipped, not treated as the end of the feed."""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.collect_news import STALE_RUN_STOP, parse_feed_stream
+
+NOW = datetime.now(timezone.utc)
+CUTOFF = NOW - timedelta(hours=24)
+
+
+def rss(ages_hours: list[float]) -> bytes:
+    items = "".join(
+        f"<item><title>Story {i}</title><link>http://example.com/{i}</link>"
+        f"<pubDate>{format_datetime(NOW - timedelta(hours=age))}</pubDate></item>"
+        for i, age in enumerate(ages_hours)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>f</title>{items}</channel></rss>'.encode()
+
+
+def chunked(body: bytes, size: int = 64):
+    return iter([body[i : i + size] for i in range(0, len(body), size)])
+
+
+def urls(entries) -> list[str]:
+    return [e["url"] for e in entries]
+
+
+def test_pinned_stale_item_does_not_hide_fresh_entries():
+    entries, _ = parse_feed_stream(chunked(rss([24 * 30, 1, 2, 3, 4, 5])), 20, CUTOFF)
+    assert urls(entries) == [f"http://example.com/{i}" for i in range(1, 6)]
+
+
+def test_out_of_order_stale_item_is_skipped():
+    entries, _ = parse_feed_stream(chunked(rss([1, 48, 2, 3])), 20, CUTOFF)
+    assert urls(entries) == ["http://example.com/0", "http://example.com/2", "http://example.com/3"]
+
+
+def test_stops_after_a_run_of_stale_entries():
+    ages = [1, 2] + [48 + i for i in range(STALE_RUN_STOP)] + [3]
+    stats: dict = {}
+    entries, _ = parse_feed_stream(chunked(rss(ages)), 20, CUTOFF, stats)
+    assert urls(entries) == ["http://example.com/0", "http://example.com/1"]
+    assert stats["stream_stopped"] == 1